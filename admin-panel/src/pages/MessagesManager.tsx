@@ -56,31 +56,62 @@ const MessagesManager = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [openDialog, setOpenDialog] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   useEffect(() => {
     fetchMessages();
   }, []);
 
+  // The API returns cursor pages of the newest messages
+  const readPage = (data: any) => {
+    const results = Array.isArray(data) ? data : data?.results;
+    const next = Array.isArray(data) ? null : data?.next;
+    setNextCursor(next ? new URL(next).searchParams.get('cursor') : null);
+    return Array.isArray(results) ? results : [];
+  };
+
   const fetchMessages = async () => {
     try {
       setError(null);
       setLoading(true);
       const response = await getContactMessages();
-      // Ensure response.data is an array
-      setMessages(Array.isArray(response.data) ? response.data : []);
+      setMessages(readPage(response.data));
     } catch (error: any) {
       console.error('Error fetching messages:', error);
       setError(error.response?.data?.detail || 'Error loading messages. Please try again.');
       setMessages([]); // Set empty array on error
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const handleLoadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await getContactMessages(nextCursor);
+      const older = readPage(response.data);
+      setMessages((current) => [...current, ...older]);
+    } catch (error) {
+      console.error('Error loading more messages:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Update the loaded messages in place, so older pages stay loaded
+  const updateMessage = (id: number, changes: Partial<ContactMessage>) => {
+    setMessages((current) =>
+      current.map((message) => (message.id === id ? { ...message, ...changes } : message))
+    );
+    setSelectedMessage((current) => (current?.id === id ? { ...current, ...changes } : current));
+  };
+
   const handleMarkAsRead = async (id: number) => {
     try {
       await markMessageAsRead(id);
-      fetchMessages();
+      updateMessage(id, { is_read: true });
     } catch (error) {
       console.error('Error marking message as read:', error);
     }
@@ -89,7 +120,7 @@ const MessagesManager = () => {
   const handleStatusChange = async (id: number, newStatus: string) => {
     try {
       await updateMessageStatus(id, newStatus);
-      fetchMessages();
+      updateMessage(id, { status: newStatus });
     } catch (error) {
       console.error('Error updating message status:', error);
     }
@@ -99,7 +130,7 @@ const MessagesManager = () => {
     if (window.confirm('Are you sure you want to delete this message?')) {
       try {
         await deleteContactMessage(id);
-        fetchMessages();
+        setMessages((current) => current.filter((message) => message.id !== id));
       } catch (error) {
         console.error('Error deleting message:', error);
       }
@@ -228,6 +259,14 @@ const MessagesManager = () => {
         </Grid>
       )}
 
+      {nextCursor && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 3 }}>
+          <Button variant="outlined" onClick={handleLoadMore} disabled={loadingMore}>
+            {loadingMore ? <CircularProgress size={24} /> : 'Load more'}
+          </Button>
+        </Box>
+      )}
+
       <Dialog open={openDialog} onClose={handleCloseDialog} maxWidth="sm" fullWidth>
         {selectedMessage && (
           <>
@@ -70,7 +70,8 @@ export const updateService = (id: number, data: any) => api.put(`/services/${id}
 export const deleteService = (id: number) => api.delete(`/services/${id}/`);
 
 // Contact Messages
-export const getContactMessages = () => api.get('/contact-messages/');
+export const getContactMessages = (cursor?: string | null) =>
+  api.get('/contact-messages/', { params: cursor ? { cursor } : undefined });
 export const getContactMessage = (id: number) => api.get(`/contact-messages/${id}/`);
 export const updateContactMessage = (id: number, data: any) => api.put(`/contact-messages/${id}/`, data);
 export const deleteContactMessage = (id: number) => api.delete(`/contact-messages/${id}/`);
@@ -48,6 +48,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'portfolio.middleware.MetricsMiddleware',  # Outside compression, so sizes are bytes sent
+    'portfolio.middleware.CompressionMiddleware',  # brotli/gzip, before anything reading the body
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS middleware
     'django.middleware.common.CommonMiddleware',
@@ -55,8 +57,38 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'portfolio.middleware.ReadOnlyRoutingMiddleware',  # Only active with a 'readonly' database
+    'portfolio.middleware.RequestLogMiddleware',
+    'portfolio.middleware.QueryBudgetMiddleware',  # Only active with DEBUG
+    'portfolio.middleware.ProfilerMiddleware',  # Staff only, on ?profile=1 or X-Profile: 1
 ]
 
+# The stateless JSON API skips sessions, CSRF, auth, messages and
+# clickjacking protection: DRF authenticates from the JWT, APIView is
+# CSRF-exempt, and without a session cookie a framed page acts for nobody.
+# Requests under these prefixes run this chain when served by core.wsgi /
+# core.asgi (see portfolio.handlers); None runs MIDDLEWARE for everything.
+# Compare both with `manage.py profile_middleware`.
+PORTFOLIO_API_PREFIXES = ('/api/',)
+PORTFOLIO_API_MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'portfolio.middleware.MetricsMiddleware',
+    'portfolio.middleware.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'portfolio.middleware.ReadOnlyRoutingMiddleware',
+    'portfolio.middleware.RequestLogMiddleware',
+    'portfolio.middleware.QueryBudgetMiddleware',
+    'portfolio.middleware.ProfilerMiddleware',
+]
+
+# Responses under this many bytes are not worth compressing
+PORTFOLIO_COMPRESSION_MIN_SIZE = 512
+PORTFOLIO_COMPRESSION_BROTLI_QUALITY = 4  # 0-11; higher is smaller but slower
+
+# Fail requests that go over a viewset's declared query_budget (DEBUG only)
+QUERY_BUDGET_RAISE = True
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -81,13 +113,66 @@ WSGI_APPLICATION = 'core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Run on every new SQLite connection. WAL lets readers work alongside the
+# single writer; NORMAL sync is durable in WAL mode except on power loss.
+SQLITE_INIT_COMMAND = ';'.join([
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA mmap_size=134217728',  # 128 MiB
+    'PRAGMA cache_size=-20000',  # ~20 MiB page cache per connection
+    'PRAGMA temp_store=MEMORY',
+])
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': SQLITE_INIT_COMMAND,
+            'timeout': 20,  # busy_timeout in seconds, instead of failing with "database is locked"
+            # Take the write lock at BEGIN so transactions never deadlock upgrading it
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Reuse connections across requests (set to 0 when serving over ASGI)
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Send reads made while serving GET/HEAD API requests to a second,
+# read-only connection to the same file (portfolio.routers.ReadOnlyRouter)
+PORTFOLIO_SQLITE_READ_ONLY_CONNECTION = False
+
+if PORTFOLIO_SQLITE_READ_ONLY_CONNECTION:
+    DATABASES['readonly'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f"file:{BASE_DIR / 'db.sqlite3'}?mode=ro",
+        'OPTIONS': {
+            'init_command': 'PRAGMA mmap_size=134217728;PRAGMA cache_size=-20000;PRAGMA query_only=ON',
+            'timeout': 20,
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['portfolio.routers.ReadOnlyRouter']
+
+
+# Cache
+# Any backend works for the portfolio response cache: swap in
+# 'django.core.cache.backends.filebased.FileBasedCache' (LOCATION a directory)
+# or 'django.core.cache.backends.redis.RedisCache' (LOCATION 'redis://127.0.0.1:6379').
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio',
+    }
+}
+
+PORTFOLIO_CACHE_ALIAS = 'default'
+PORTFOLIO_CACHE_TIMEOUT = 60 * 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -129,6 +214,11 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Responsive image derivatives, generated by a background worker pool
+PORTFOLIO_IMAGE_WIDTHS = (320, 640, 1024)
+PORTFOLIO_IMAGE_FORMATS = ('avif', 'webp', 'jpeg')  # Unsupported formats are skipped
+PORTFOLIO_IMAGE_WORKERS = 2
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -159,20 +249,99 @@ CORS_ALLOW_HEADERS = [
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # Builds request.user from token claims; no user query per request
+        'portfolio.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Paginates when ?page= is passed; plain lists otherwise
+    'DEFAULT_PAGINATION_CLASS': 'portfolio.pagination.OptInPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'contact': '5/minute',  # Per IP, contact form submissions only
+    },
+    'DEFAULT_RENDERER_CLASSES': [
+        'portfolio.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
+# Serve unpaginated lists from precompiled .values() plans (portfolio/fast.py)
+PORTFOLIO_FAST_SERIALIZATION = True
+PORTFOLIO_SERIALIZATION_PLANS = 256  # Most recently used ?fields=/?expand= plans kept per process
+
+# Rows per database fetch for ?stream=1 list responses
+PORTFOLIO_STREAM_CHUNK_SIZE = 500
+
+# Pre-rendered, pre-compressed API snapshots for a CDN or front proxy
+# (python manage.py export_static_json). Serve <root>/current/manifest.json.
+PORTFOLIO_STATIC_EXPORT_ROOT = BASE_DIR / 'static-export'
+PORTFOLIO_STATIC_EXPORT_BASE_URL = 'http://localhost:8000'  # Host used for absolute media URLs
+PORTFOLIO_STATIC_EXPORT_ON_CHANGE = False  # Re-export in the background after every write
+
+# Contact form submissions are queued in a separate SQLite file and stored
+# in batches by a background thread (or python manage.py process_contact_queue)
+PORTFOLIO_CONTACT_QUEUE = True
+PORTFOLIO_CONTACT_QUEUE_PATH = BASE_DIR / 'queue' / 'contact.sqlite3'
+PORTFOLIO_CONTACT_QUEUE_MAX_DEPTH = 1000  # Answer 503 beyond this backlog
+PORTFOLIO_CONTACT_QUEUE_BATCH_SIZE = 100
+PORTFOLIO_CONTACT_DEDUP_WINDOW = 60 * 60 * 24  # Seconds; identical resubmissions are dropped
+PORTFOLIO_CONTACT_NOTIFY_ADMINS = False  # mail_admins for every stored batch
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'portfolio.authentication.ClaimsTokenObtainPairSerializer',
+}
+
+# Seconds a user's auth version is cached; bounds how long a revoked token
+# (password change, deactivation, staff flag change) keeps working elsewhere
+PORTFOLIO_AUTH_VERSION_TTL = 60
+
+# Logging
+# Per-request API records are sampled and written from a background thread.
+
+PORTFOLIO_REQUEST_LOG_SAMPLE_RATE = 0.1
+
+# Per-request Server-Timing headers and the histograms at /api/metrics/
+# (readable by staff, and by scrapers that send this token in an
+# X-Metrics-Token header; None lets staff in only)
+PORTFOLIO_METRICS = True
+PORTFOLIO_METRICS_TOKEN = None
+PORTFOLIO_SERVER_TIMING = True
+
+# On-demand request profiles for staff, written to PORTFOLIO_PROFILE_DIR and
+# browsable at /admin/profiles/. Queries slower than the threshold get an
+# EXPLAIN QUERY PLAN; only the newest PORTFOLIO_PROFILE_KEEP reports are kept.
+PORTFOLIO_PROFILER = True
+PORTFOLIO_PROFILE_DIR = BASE_DIR / 'profiles'
+PORTFOLIO_PROFILE_SLOW_QUERY_MS = 5
+PORTFOLIO_PROFILE_KEEP = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {
+            '()': 'portfolio.instrumentation.JsonFormatter',
+        },
+    },
+    'handlers': {
+        'request_queue': {
+            'class': 'portfolio.instrumentation.QueueStreamHandler',
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'portfolio.requests': {
+            'handlers': ['request_queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
 }
 
 # Default primary key field type
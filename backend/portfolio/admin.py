@@ -1,22 +1,57 @@
+from functools import reduce
+from operator import and_, or_
+
 from django.contrib import admin
+from django.db.models import Q
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+from .bulk import bulk_update_messages
 from .models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
+from .profiling import list_reports, load_report, stats_path
+from .search import indexed_fields, search_pks
 
 # Register your models here.
 
+class FullTextSearchMixin:
+    """
+    Answer the changelist search box from the FTS5 index instead of LIKE
+    scans. search_fields the index doesn't cover, such as email, still get
+    the usual icontains match, OR-ed with the index hits.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        condition = Q()
+        subquery = search_pks(self.model, search_term)
+        if subquery is not None:
+            condition |= Q(pk__in=subquery)
+        indexed = indexed_fields(self.model)
+        unindexed = [field for field in self.get_search_fields(request) if field not in indexed]
+        if unindexed:
+            condition |= reduce(and_, [
+                reduce(or_, [Q(**{f'{field}__icontains': word}) for field in unindexed])
+                for word in search_term.split()
+            ])
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
+
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('title', 'created_at', 'updated_at')
     search_fields = ('title', 'description')
     list_filter = ('created_at',)
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'designation', 'department', 'email', 'is_active')
     search_fields = ('name', 'designation', 'email')
     list_filter = ('department', 'is_active')
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
+class ProjectAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('title', 'category', 'client', 'status', 'start_date')
     search_fields = ('title', 'description', 'client')
     list_filter = ('status', 'category')
@@ -32,9 +67,72 @@ class ContactMessageAdmin(admin.ModelAdmin):
     search_fields = ('name', 'email', 'subject', 'message')
     list_filter = ('status', 'is_read', 'created_at')
     readonly_fields = ('created_at', 'updated_at')
+    actions = ('mark_read', 'mark_unread', 'mark_in_progress', 'mark_completed', 'mark_archived')
+
+    def bulk_update(self, request, queryset, description, **changes):
+        count = bulk_update_messages(queryset, **changes)
+        self.message_user(request, f'{count} message(s) {description}.')
+
+    @admin.action(description='Mark selected messages as read')
+    def mark_read(self, request, queryset):
+        self.bulk_update(request, queryset, 'marked as read', is_read=True)
+
+    @admin.action(description='Mark selected messages as unread')
+    def mark_unread(self, request, queryset):
+        self.bulk_update(request, queryset, 'marked as unread', is_read=False)
+
+    @admin.action(description='Set status: In Progress')
+    def mark_in_progress(self, request, queryset):
+        self.bulk_update(request, queryset, 'moved to In Progress', status='IN_PROGRESS')
+
+    @admin.action(description='Set status: Completed')
+    def mark_completed(self, request, queryset):
+        self.bulk_update(request, queryset, 'completed', status='COMPLETED')
+
+    @admin.action(description='Archive selected messages')
+    def mark_archived(self, request, queryset):
+        self.bulk_update(request, queryset, 'archived', status='ARCHIVED')
 
 @admin.register(Testimonial)
-class TestimonialAdmin(admin.ModelAdmin):
+class TestimonialAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ('name', 'company', 'rating', 'is_active')
     search_fields = ('name', 'company', 'content')
     list_filter = ('rating', 'is_active')
+
+
+def profile_report_list(request):
+    reports = list_reports()
+    for report in reports:
+        report['slow_count'] = sum(query.get('slow', False) for query in report['queries'])
+    return TemplateResponse(request, 'admin/portfolio/profile_list.html', {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'reports': reports,
+    })
+
+
+def profile_report_detail(request, report_id):
+    report = load_report(report_id)
+    if report is None:
+        raise Http404('No such profile report')
+    return TemplateResponse(request, 'admin/portfolio/profile_detail.html', {
+        **admin.site.each_context(request),
+        'title': f'{report["method"]} {report["path"]}',
+        'report': report,
+        'slow_queries': [query for query in report['queries'] if query.get('slow')],
+    })
+
+
+def profile_report_stats(request, report_id):
+    path = stats_path(report_id)
+    if path is None:
+        raise Http404('No such profile report')
+    return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
+
+
+# Mounted under /admin/profiles/ by core/urls.py
+profile_urls = [
+    path('', admin.site.admin_view(profile_report_list), name='admin-profile-list'),
+    path('<str:report_id>/', admin.site.admin_view(profile_report_detail), name='admin-profile-detail'),
+    path('<str:report_id>/stats/', admin.site.admin_view(profile_report_stats), name='admin-profile-stats'),
+]
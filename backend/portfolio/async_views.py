@@ -0,0 +1,148 @@
+from hashlib import md5
+
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.views import View
+
+from .cache import KEY_PREFIX, aget_model_version, get_cache, get_timeout
+from .fast import fast_serialization_enabled, get_plan
+from .instrumentation import timed_serialization
+from .models import Service, Employee, Project, ContactInformation, Testimonial
+from .renderers import FastJSONRenderer
+from .serializers import (
+    ServiceSerializer,
+    EmployeeSerializer,
+    ProjectSerializer,
+    ContactInformationSerializer,
+    TestimonialSerializer,
+)
+
+
+class AsyncReadView(View):
+    """
+    Async list and detail endpoint for a public model.
+
+    Mirrors the read side of the matching viewset byte for byte, but reads
+    through the async ORM and cache so an ASGI worker serves it on the event
+    loop instead of a thread per request. Writes stay on the DRF viewsets.
+    """
+
+    http_method_names = ['get', 'head']
+    model = None
+    serializer_class = None
+    filter_params = ()
+    cache_models = ()
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def filter_queryset(self, queryset):
+        for name in self.filter_params:
+            value = self.request.GET.get(name)
+            if value:
+                queryset = queryset.filter(**{name: value})
+        return queryset
+
+    async def get(self, request, pk=None):
+        cache = get_cache()
+        key = await self.cache_key(pk)
+        content = await cache.aget(key)
+        if content is not None:
+            return self.response(content, 'HIT')
+
+        queryset = self.filter_queryset(self.get_queryset())
+        with timed_serialization(request):
+            try:
+                data = await (self.list(queryset) if pk is None else self.retrieve(queryset, pk))
+            except self.model.DoesNotExist:
+                body = {'detail': f'No {self.model._meta.object_name} matches the given query.'}
+                return self.response(FastJSONRenderer().render(body), status=404)
+            content = FastJSONRenderer().render(data)
+        await cache.aset(key, content, get_timeout())
+        return self.response(content, 'MISS')
+
+    async def list(self, queryset):
+        plan = self.get_plan()
+        if plan is None:
+            return await sync_to_async(self.serialize)(self.prepare_queryset(queryset), many=True)
+        return await plan.arun(queryset, self.request)
+
+    async def retrieve(self, queryset, pk):
+        plan = self.get_plan()
+        if plan is None:
+            instance = await self.prepare_queryset(queryset).aget(pk=pk)
+            return await sync_to_async(self.serialize)(instance)
+        return await plan.aget(queryset, self.request, pk=pk)
+
+    def get_plan(self):
+        return get_plan(self.serializer_class) if fast_serialization_enabled() else None
+
+    def prepare_queryset(self, queryset):
+        """Hook for the prefetches the serializer fallback needs; plans fetch relations themselves."""
+        return queryset
+
+    def serialize(self, instance, many=False):
+        context = {'request': self.request}
+        return self.serializer_class(instance, many=many, context=context).data
+
+    async def cache_key(self, pk):
+        versions = [await aget_model_version(model) for model in self.cache_models or (self.model,)]
+        params = [(name, self.request.GET.get(name, '')) for name in self.filter_params]
+        raw = f'{versions}|{params}|{pk}|{self.request.get_host()}'
+        digest = md5(raw.encode(), usedforsecurity=False).hexdigest()
+        return f'{KEY_PREFIX}:async:{self.model._meta.model_name}:{digest}'
+
+    def response(self, content, outcome=None, status=200):
+        response = HttpResponse(content, status=status, content_type='application/json')
+        if outcome:
+            response['X-Cache'] = outcome
+        return response
+
+
+class AsyncServiceView(AsyncReadView):
+    model = Service
+    serializer_class = ServiceSerializer
+
+
+class AsyncEmployeeView(AsyncReadView):
+    model = Employee
+    serializer_class = EmployeeSerializer
+    filter_params = ('department',)
+
+    def get_queryset(self):
+        return Employee.objects.filter(is_active=True)
+
+
+class AsyncProjectView(AsyncReadView):
+    model = Project
+    serializer_class = ProjectSerializer
+    filter_params = ('status', 'category')
+    cache_models = (Project, Employee)
+
+    def prepare_queryset(self, queryset):
+        # Same member order as ProjectViewSet
+        return queryset.prefetch_related(
+            Prefetch('team_members', queryset=Employee.objects.order_by('name', 'id'))
+        )
+
+
+class AsyncTestimonialView(AsyncReadView):
+    model = Testimonial
+    serializer_class = TestimonialSerializer
+    filter_params = ('rating',)
+
+    def get_queryset(self):
+        return Testimonial.objects.filter(is_active=True)
+
+
+class AsyncContactInformationView(AsyncReadView):
+    model = ContactInformation
+    serializer_class = ContactInformationSerializer
+
+    async def list(self, queryset):
+        # Like the viewset: the first instance, or an empty object
+        instance = await queryset.afirst()
+        if instance is None:
+            return {}
+        return await self.retrieve(queryset, instance.pk)
@@ -0,0 +1,80 @@
+from django.db import connections, router, transaction
+from django.db.models.signals import m2m_changed
+from django.utils import timezone
+
+from .cache import invalidate_on_commit
+from .models import ContactMessage, Employee, Project
+
+
+class UnknownEmployees(ValueError):
+    def __init__(self, ids):
+        super().__init__(f'Unknown employee ids: {ids}')
+        self.ids = ids
+
+
+def bulk_update_messages(queryset, **changes):
+    """
+    Apply ``changes`` to every message in ``queryset`` with one UPDATE and
+    return the number of rows affected.
+
+    Like ``save(update_fields=...)`` this only writes the given columns plus
+    ``updated_at``. QuerySet.update() sends no post_save, so the cache
+    is invalidated here instead of by the signal handlers.
+    """
+    changes['updated_at'] = timezone.now()
+    count = queryset.order_by().update(**changes)
+    if count:
+        invalidate_on_commit(ContactMessage, queryset.db)
+    return count
+
+
+def update_team_members(project, add=(), remove=(), replace=None):
+    """
+    Apply a batch of membership changes to ``project`` and return the new
+    team as employee ids ordered like the API orders them (name, id).
+
+    Every id is checked with one IN query. The current team is read and the
+    through table written with at most one DELETE and one bulk INSERT in a
+    single transaction that locks the project row, so concurrent batches
+    apply one after the other; m2m_changed fires once per direction that
+    actually changed.
+    """
+    requested = set(add) | set(remove) | set(replace or ())
+    names = dict(Employee.objects.filter(pk__in=requested).values_list('pk', 'name'))
+    missing = sorted(requested - names.keys())
+    if missing:
+        raise UnknownEmployees(missing)
+
+    through = Project.team_members.through
+    using = router.db_for_write(through, instance=project)
+    with transaction.atomic(using=using):
+        if connections[using].features.has_select_for_update:
+            Project.objects.using(using).select_for_update().filter(pk=project.pk).exists()
+        current = dict(
+            through.objects.using(using).filter(project=project).values_list('employee_id', 'employee__name')
+        )
+        if replace is not None:
+            to_add = set(replace) - current.keys()
+            to_remove = current.keys() - set(replace)
+        else:
+            to_add = set(add) - current.keys()
+            to_remove = set(remove) & current.keys()
+
+        if to_remove:
+            through.objects.using(using).filter(project=project, employee_id__in=to_remove).delete()
+        if to_add:
+            # Without row locks (SQLite) a concurrent batch may have added
+            # the same member since the read above
+            through.objects.using(using).bulk_create(
+                [through(project=project, employee_id=pk) for pk in sorted(to_add)], ignore_conflicts=True,
+            )
+        for action, pk_set in (('post_remove', to_remove), ('post_add', to_add)):
+            if pk_set:
+                m2m_changed.send(
+                    sender=through, instance=project, action=action, reverse=False,
+                    model=Employee, pk_set=pk_set, using=using,
+                )
+
+    members = {pk: name for pk, name in current.items() if pk not in to_remove}
+    members.update((pk, names[pk]) for pk in to_add)
+    return [pk for pk, name in sorted(members.items(), key=lambda item: (item[1], item[0]))]
@@ -0,0 +1,109 @@
+from hashlib import md5
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from .cache import KEY_PREFIX, get_cache, get_model_version
+from .fast import get_plan
+from .models import Service, Employee, Project, ContactInformation, Testimonial
+from .serializers import (
+    ServiceSerializer,
+    EmployeeSerializer,
+    ProjectSerializer,
+    ContactInformationSerializer,
+    TestimonialSerializer,
+)
+
+
+def serialize_list(serializer_class, queryset, request):
+    plan = get_plan(serializer_class)
+    if plan is not None:
+        return plan.run(queryset, request)
+    return serializer_class(queryset, many=True, context={'request': request}).data
+
+
+def build_services(request):
+    return serialize_list(ServiceSerializer, Service.objects.all(), request)
+
+
+def build_employees(request):
+    return serialize_list(EmployeeSerializer, Employee.objects.filter(is_active=True), request)
+
+
+def build_projects(request):
+    queryset = Project.objects.prefetch_related(
+        Prefetch('team_members', queryset=Employee.objects.order_by('name', 'id'))
+    )
+    return serialize_list(ProjectSerializer, queryset, request)
+
+
+def build_testimonials(request):
+    return serialize_list(TestimonialSerializer, Testimonial.objects.filter(is_active=True), request)
+
+
+def build_contact_info(request):
+    instance = ContactInformation.objects.first()
+    if instance is None:
+        return {}
+    return ContactInformationSerializer(instance, context={'request': request}).data
+
+
+# Section name -> (builder, models the section's payload depends on).
+# Each section mirrors the plain list response of its endpoint.
+SECTIONS = {
+    'services': (build_services, (Service,)),
+    'employees': (build_employees, (Employee,)),
+    'projects': (build_projects, (Project, Employee)),
+    'testimonials': (build_testimonials, (Testimonial,)),
+    'contact_info': (build_contact_info, (ContactInformation,)),
+}
+
+
+def get_bundle_timeout():
+    return getattr(settings, 'PORTFOLIO_BUNDLE_TIMEOUT', 60 * 60 * 24)
+
+
+def section_version(models):
+    return '.'.join(str(get_model_version(model)) for model in models)
+
+
+def _key(*parts):
+    digest = md5(':'.join(parts).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'{KEY_PREFIX}:bundle:{digest}'
+
+
+def bundle_versions(request):
+    """Return ``{section: version}`` and the ETag for the current snapshot."""
+    host = request._current_scheme_host
+    versions = {name: section_version(models) for name, (_, models) in SECTIONS.items()}
+    etag = _key(host, *(f'{name}={version}' for name, version in versions.items()))
+    return versions, etag.rsplit(':', 1)[1]
+
+
+def get_bundle(request, versions=None, etag=None):
+    """
+    Return the snapshot of every public section.
+
+    The assembled snapshot is cached under the combined section versions.
+    When a model changes only the sections that depend on it are rebuilt;
+    the others are reused from their own cache entries.
+    """
+    if versions is None:
+        versions, etag = bundle_versions(request)
+    cache = get_cache()
+    host = request._current_scheme_host
+    bundle_key = _key(host, 'all', etag)
+    bundle = cache.get(bundle_key)
+    if bundle is not None:
+        return bundle
+
+    bundle = {}
+    for name, (builder, _) in SECTIONS.items():
+        section_key = _key(host, name, versions[name])
+        data = cache.get(section_key)
+        if data is None:
+            data = builder(request)
+            cache.set(section_key, data, get_bundle_timeout())
+        bundle[name] = data
+    cache.set(bundle_key, bundle, get_bundle_timeout())
+    return bundle
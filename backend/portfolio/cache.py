@@ -0,0 +1,133 @@
+from functools import wraps
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+KEY_PREFIX = 'portfolio'
+
+
+def get_cache():
+    return caches[getattr(settings, 'PORTFOLIO_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'PORTFOLIO_CACHE_TIMEOUT', 300)
+
+
+def _version_key(model):
+    return f'{KEY_PREFIX}:version:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    cache = get_cache()
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Versions must outlive the responses built on top of them
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+async def aget_model_version(model):
+    cache = get_cache()
+    key = _version_key(model)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, 1, timeout=None)
+        version = await cache.aget(key, 1)
+    return version
+
+
+def bump_model_version(model):
+    """Invalidate every cached response that depends on ``model``."""
+    cache = get_cache()
+    key = _version_key(model)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+        return 2
+
+
+def invalidate_on_commit(model, using=None):
+    """
+    Bump ``model``'s version once the current transaction commits.
+
+    A response another request builds from the pre-commit rows in the
+    meantime is cached under the old version, or, inside a transaction,
+    under the one bumped right away so this transaction reads its own
+    writes; either way the bump after commit orphans it.
+    """
+    if transaction.get_connection(using).in_atomic_block:
+        bump_model_version(model)
+    transaction.on_commit(lambda: bump_model_version(model), using=using)
+
+
+def _record(endpoint, outcome):
+    cache = get_cache()
+    for key in (f'{KEY_PREFIX}:stats:{outcome}', f'{KEY_PREFIX}:stats:{endpoint}:{outcome}'):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key)
+
+
+def cache_stats(endpoints=()):
+    """Return hit/miss counters, overall and for the given endpoints."""
+    cache = get_cache()
+    names = [''] + [f'{endpoint}:' for endpoint in endpoints]
+    stats = {}
+    for name in names:
+        label = name.rstrip(':') or 'total'
+        stats[label] = {
+            outcome: cache.get(f'{KEY_PREFIX}:stats:{name}{outcome}', 0)
+            for outcome in ('hits', 'misses')
+        }
+    return stats
+
+
+def response_cache_key(view, request):
+    versions = '.'.join(str(get_model_version(model)) for model in view.cache_models)
+    params = sorted(
+        (name, request.query_params.get(name))
+        for name in view.cache_query_params
+        if name in request.query_params
+    )
+    lookup = view.kwargs.get(view.lookup_url_kwarg or view.lookup_field, '')
+    # Paginated responses carry absolute next/previous URLs
+    raw = f'{view.basename}:{view.action}:{lookup}:{params}:{request._current_scheme_host}'
+    digest = md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'{KEY_PREFIX}:response:{view.basename}:{versions}:{digest}'
+
+
+def cache_response(method):
+    """
+    Serve a viewset action from the response cache.
+
+    Keys include the current version of every model in ``cache_models``,
+    so a bump from the signal handlers orphans stale entries.
+    """
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        cache = get_cache()
+        key = response_cache_key(self, request)
+        data = cache.get(key)
+        if data is not None:
+            _record(self.basename, 'hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _record(self.basename, 'misses')
+        response = method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not response.streaming:
+            cache.set(key, response.data, get_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+    return wrapper
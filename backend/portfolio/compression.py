@@ -0,0 +1,80 @@
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'image/svg+xml')
+
+
+def available_encodings():
+    """Encodings this server can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the best encoding from an Accept-Encoding header, or None.
+
+    Highest q-value wins; ties go to the server's preference (brotli first).
+    """
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    candidates = [
+        (weights.get(coding, weights.get('*', 0.0)), -rank, coding)
+        for rank, coding in enumerate(available_encodings())
+    ]
+    q, _, coding = max(candidates)
+    return coding if q > 0 else None
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(';')[0].strip().lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) or content_type.endswith('+json')
+
+
+def compress(content, encoding, quality=4, max_random_bytes=None):
+    if encoding == 'br':
+        return brotli.compress(content, quality=quality)
+    return compress_string(content, max_random_bytes=max_random_bytes)
+
+
+def compress_stream(chunks, encoding, quality=4, max_random_bytes=None):
+    if encoding == 'gzip':
+        yield from compress_sequence(chunks, max_random_bytes=max_random_bytes)
+        return
+    compressor = brotli.Compressor(quality=quality)
+    for chunk in chunks:
+        # Flush per chunk so clients see data as soon as the view yields it
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding, quality=4, max_random_bytes=None):
+    if encoding == 'gzip':
+        async for chunk in chunks:
+            yield compress_string(chunk, max_random_bytes=max_random_bytes)
+        return
+    compressor = brotli.Compressor(quality=quality)
+    async for chunk in chunks:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
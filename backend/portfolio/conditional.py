@@ -0,0 +1,90 @@
+from functools import wraps
+from hashlib import md5
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .cache import get_cache, get_timeout, response_cache_key
+
+
+def compute_validators(view):
+    """
+    Return ``(etag, last_modified)`` for the current list or detail request.
+
+    A list is described by max(updated_at) and the row count of the
+    filtered queryset, a detail by the object's own updated_at. The model
+    versions from the response cache are folded in so changes that never
+    touch updated_at (team membership, nested employees) still change the
+    ETag.
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    if view.action == 'retrieve':
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            queryset = queryset.filter(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            return None, None
+    summary = queryset.order_by().aggregate(last=Max('updated_at'), count=Count('pk'))
+    if view.action == 'retrieve' and not summary['count']:
+        return None, None
+
+    last_modified = summary['last'].timestamp() if summary['last'] else None
+    key = response_cache_key(view, view.request)
+    raw = f"{key}:{last_modified}:{summary['count']}"
+    etag = md5(raw.encode('utf-8'), usedforsecurity=False).hexdigest()
+    # Last-Modified is only trustworthy when the payload has no nested models
+    if tuple(view.cache_models) != (queryset.model,):
+        last_modified = None
+    return etag, last_modified
+
+
+def get_validators(view):
+    # Validators share the response cache's versioned keys, so a warm
+    # conditional request costs no queries at all
+    cache = get_cache()
+    key = response_cache_key(view, view.request) + ':validators'
+    validators = cache.get(key)
+    if validators is None:
+        validators = compute_validators(view)
+        cache.set(key, validators, get_timeout())
+    return validators
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Evaluate If-None-Match, then If-Modified-Since. ETags compare weakly, so
+    a tag weakened by CompressionMiddleware still matches.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or quote_etag(etag) in etags or f'W/{quote_etag(etag)}' in etags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if if_modified_since is not None and last_modified is not None:
+        return int(last_modified) <= if_modified_since
+    return False
+
+
+def conditional_get(method):
+    """Answer If-None-Match / If-Modified-Since with 304 before serializing."""
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = get_validators(self)
+        if etag is None:
+            return method(self, request, *args, **kwargs)
+
+        if not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = quote_etag(etag)
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+    return wrapper
@@ -0,0 +1,294 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+
+from django.conf import settings
+from django.utils.encoding import iri_to_uri
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+from .serializers import ImageSrcsetField
+from .images import build_srcset
+
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.BooleanField,
+    serializers.IntegerField,
+)
+
+_plans = OrderedDict()
+_plans_lock = threading.Lock()
+
+
+class URLBuilder:
+    """
+    Stand-in for ``request`` in transformers that only need
+    ``build_absolute_uri``, resolving the scheme and host once per run.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.prefix = request._current_scheme_host
+
+    def build_absolute_uri(self, location):
+        # Same result as HttpRequest.build_absolute_uri for root-relative paths
+        if location.startswith('/') and not location.startswith('//') \
+                and '/./' not in location and '/../' not in location:
+            return iri_to_uri(self.prefix + location)
+        return self.request.build_absolute_uri(location)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def _datetime(field):
+    def transform(value, request):
+        value = field.enforce_timezone(value).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        raise UnsupportedField(field.field_name)
+    return transform
+
+
+def _date(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        raise UnsupportedField(field.field_name)
+    return lambda value, request: value.isoformat()
+
+
+def _file(model_field):
+    storage = model_field.storage
+
+    def transform(value, request):
+        if not value:
+            return None
+        url = storage.url(value)
+        return request.build_absolute_uri(url) if request is not None else url
+    return transform
+
+
+def _srcset(value, request):
+    return build_srcset(value, request) if value else None
+
+
+def _json(field):
+    if field.binary:
+        raise UnsupportedField(field.field_name)
+    return None
+
+
+class SerializationPlan:
+    """
+    Precompiled read path equivalent to one serializer configuration.
+
+    Rows are fetched with ``.values()`` and turned into dicts by per-field
+    transformers, skipping DRF's per-object, per-field machinery. Many-to-many
+    relations are resolved with one query on the through table (plus one for
+    nested rows) instead of a prefetch.
+    """
+
+    def __init__(self, serializer):
+        model = serializer.Meta.model
+        self.model = model
+        self.pk = model._meta.pk.attname
+        self.columns = [self.pk]
+        self.fields = []
+        self.relations = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            source = field.source
+            if '.' in source or source == '*':
+                raise UnsupportedField(name)
+            model_field = model._meta.get_field(source)
+            if model_field.many_to_many:
+                self.relations.append((name, model_field, self.compile_relation(field)))
+                self.fields.append((name, None, None))
+                continue
+            if model_field.attname not in self.columns:
+                self.columns.append(model_field.attname)
+            self.fields.append((name, model_field.attname, self.compile_field(field, model_field)))
+
+    def compile_field(self, field, model_field):
+        if isinstance(field, ImageSrcsetField):
+            return _srcset
+        if isinstance(field, serializers.FileField):
+            if not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+                raise UnsupportedField(field.field_name)
+            return _file(model_field)
+        if isinstance(field, serializers.DateTimeField):
+            return _datetime(field)
+        if isinstance(field, serializers.DateField):
+            return _date(field)
+        if isinstance(field, serializers.JSONField):
+            return _json(field)
+        if isinstance(field, IDENTITY_FIELDS) or type(field) is serializers.ReadOnlyField:
+            return None
+        raise UnsupportedField(field.field_name)
+
+    def compile_relation(self, field):
+        if isinstance(field, ManyRelatedField) and isinstance(field.child_relation, PrimaryKeyRelatedField):
+            return None
+        if isinstance(field, serializers.ListSerializer):
+            plan = SerializationPlan(field.child)
+            if plan.relations:
+                raise UnsupportedField(field.field_name)
+            return plan
+        raise UnsupportedField(field.field_name)
+
+    def run(self, queryset, request=None):
+        if request is not None:
+            request = URLBuilder(request)
+        rows = list(queryset.prefetch_related(None).values(*self.columns))
+        return self.build_rows(rows, request)
+
+    def stream(self, queryset, request=None, chunk_size=500):
+        """
+        Yield built rows in lists of at most ``chunk_size``, reading the
+        queryset with a server-side iterator so memory stays flat.
+        """
+        if request is not None:
+            request = URLBuilder(request)
+        rows = queryset.prefetch_related(None).values(*self.columns).iterator(chunk_size=chunk_size)
+        for chunk in chunked(rows, chunk_size):
+            yield self.build_rows(chunk, request)
+
+    def build_rows(self, rows, request):
+        pks = [row[self.pk] for row in rows]
+        related = {
+            name: self.fetch_relation(model_field, plan, pks, request)
+            for name, model_field, plan in self.relations
+        }
+        return [self.build(row, request, related) for row in rows]
+
+    def build(self, row, request, related=None):
+        data = {}
+        for name, column, transform in self.fields:
+            if column is None:
+                data[name] = related[name].get(row[self.pk], [])
+                continue
+            value = row[column]
+            if transform is not None and value is not None:
+                value = transform(value, request)
+            data[name] = value
+        return data
+
+    def fetch_relation(self, model_field, plan, pks, request):
+        """
+        Map each owner pk to its related ids or nested dicts in one query
+        on the through table, ordered the way the prefetch orders them.
+        """
+        links = self.relation_links(model_field, plan, pks)
+        return self.group_links(links, plan, request)
+
+    def relation_links(self, model_field, plan, pks):
+        through = model_field.remote_field.through
+        owner = model_field.m2m_field_name()
+        target = model_field.m2m_reverse_field_name()
+        ordering = []
+        for name in model_field.related_model._meta.ordering:
+            prefix = '-' if name.startswith('-') else ''
+            ordering.append(f'{prefix}{target}__{name.lstrip("-")}')
+        columns = [f'{target}_id'] if plan is None else [f'{target}__{c}' for c in plan.columns]
+        return (
+            through.objects.filter(**{f'{owner}__in': pks})
+            .order_by(*ordering, f'{target}__pk')
+            .values_list(f'{owner}_id', *columns)
+        )
+
+    def group_links(self, links, plan, request):
+        members = {}
+        if plan is None:
+            for owner_pk, target_pk in links:
+                members.setdefault(owner_pk, []).append(target_pk)
+            return members
+
+        built = {}
+        for owner_pk, *values in links:
+            row = dict(zip(plan.columns, values))
+            target_pk = row[plan.pk]
+            if target_pk not in built:
+                built[target_pk] = plan.build(row, request)
+            members.setdefault(owner_pk, []).append(built[target_pk])
+        return members
+
+    async def arun(self, queryset, request=None):
+        """``run`` for async views, reading through the async ORM."""
+        if request is not None:
+            request = URLBuilder(request)
+        values = queryset.prefetch_related(None).values(*self.columns)
+        return await self.abuild_rows([row async for row in values.aiterator()], request)
+
+    async def aget(self, queryset, request=None, **lookup):
+        """Build a single object; raises ``DoesNotExist`` like ``aget``."""
+        if request is not None:
+            request = URLBuilder(request)
+        row = await queryset.prefetch_related(None).values(*self.columns).aget(**lookup)
+        rows = await self.abuild_rows([row], request)
+        return rows[0]
+
+    async def abuild_rows(self, rows, request):
+        pks = [row[self.pk] for row in rows]
+        related = {}
+        for name, model_field, plan in self.relations:
+            links = self.relation_links(model_field, plan, pks)
+            related[name] = self.group_links([link async for link in links], plan, request)
+        return [self.build(row, request, related) for row in rows]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@lru_cache
+def _field_names(serializer_class):
+    """Every name ``fields`` and ``expand`` can select on the serializer."""
+    return frozenset(serializer_class().fields) | frozenset(getattr(serializer_class, 'expandable_fields', ()))
+
+
+def get_plan(serializer_class, fields=(), expand=()):
+    """
+    Return a cached plan for the serializer configuration, or None.
+
+    Names the serializer does not know are left out of the cache key, as
+    they do not change the output, and only the PORTFOLIO_SERIALIZATION_PLANS
+    most recently used plans are kept, so query strings cannot grow the cache.
+    """
+    key = (serializer_class, bool(fields), frozenset(), ())
+    if fields or expand:
+        names = _field_names(serializer_class)
+        # Expanded relations are appended in the order they were asked for
+        key = (serializer_class, bool(fields), names.intersection(fields),
+               tuple(dict.fromkeys(name for name in expand if name in names)))
+    with _plans_lock:
+        if key in _plans:
+            _plans.move_to_end(key)
+            return _plans[key]
+    kwargs = {'fields': fields, 'expand': expand} if fields or expand else {}
+    try:
+        plan = SerializationPlan(serializer_class(**kwargs))
+    except UnsupportedField:
+        plan = None
+    with _plans_lock:
+        _plans[key] = plan
+        while len(_plans) > getattr(settings, 'PORTFOLIO_SERIALIZATION_PLANS', 256):
+            _plans.popitem(last=False)
+    return plan
+
+
+def fast_serialization_enabled():
+    return getattr(settings, 'PORTFOLIO_FAST_SERIALIZATION', True)
+
+
+def get_stream_chunk_size():
+    return getattr(settings, 'PORTFOLIO_STREAM_CHUNK_SIZE', 500)
@@ -0,0 +1,166 @@
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.handlers.wsgi import WSGIHandler
+from django.utils.module_loading import import_string
+
+
+class MiddlewareProfile(BaseHandler):
+    """A middleware chain built from an explicit list instead of settings.MIDDLEWARE."""
+
+    def __init__(self, middleware, is_async=False):
+        super().__init__()
+        self.middleware = list(middleware)
+        self.load_middleware(is_async=is_async)
+
+    def load_middleware(self, is_async=False):
+        # BaseHandler.load_middleware as of Django 5.2, reading self.middleware.
+        # MiddlewareSplitTests checks both still build the same chain.
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        get_response = self._get_response_async if is_async else self._get_response
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(self.middleware):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, 'sync_capable', True)
+            middleware_can_async = getattr(middleware, 'async_capable', False)
+            if not middleware_can_sync and not middleware_can_async:
+                raise RuntimeError(
+                    f'Middleware {middleware_path} must have at least one of sync_capable/async_capable set to True.'
+                )
+            middleware_is_async = middleware_can_async if handler_is_async or not middleware_can_sync else False
+            try:
+                adapted_handler = self.adapt_method_mode(
+                    middleware_is_async, handler, handler_is_async,
+                    debug=settings.DEBUG, name=f'middleware {middleware_path}',
+                )
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+            handler = adapted_handler
+            if mw_instance is None:
+                raise ImproperlyConfigured(f'Middleware factory {middleware_path} returned None.')
+
+            if hasattr(mw_instance, 'process_view'):
+                self._view_middleware.insert(0, self.adapt_method_mode(is_async, mw_instance.process_view))
+            if hasattr(mw_instance, 'process_template_response'):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, 'process_exception'):
+                # Exception middleware always runs synchronously, as in Django
+                self._exception_middleware.append(self.adapt_method_mode(False, mw_instance.process_exception))
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        self._middleware_chain = self.adapt_method_mode(is_async, handler, handler_is_async)
+
+
+class SplitMiddlewareMixin:
+    """
+    Run requests under PORTFOLIO_API_PREFIXES through the lean
+    PORTFOLIO_API_MIDDLEWARE chain and everything else, including /admin/,
+    through the full MIDDLEWARE chain. PORTFOLIO_API_MIDDLEWARE = None turns
+    the split off.
+    """
+
+    def load_middleware(self, is_async=False):
+        super().load_middleware(is_async=is_async)
+        self.api_prefixes = tuple(getattr(settings, 'PORTFOLIO_API_PREFIXES', ('/api/',)))
+        middleware = getattr(settings, 'PORTFOLIO_API_MIDDLEWARE', None)
+        self.api_profile = None if middleware is None else MiddlewareProfile(middleware, is_async)
+
+    def get_profile(self, request):
+        if self.api_profile is not None and request.path_info.startswith(self.api_prefixes):
+            return self.api_profile
+        return None
+
+    def get_response(self, request):
+        profile = self.get_profile(request)
+        if profile is not None:
+            return profile.get_response(request)
+        return super().get_response(request)
+
+    async def get_response_async(self, request):
+        profile = self.get_profile(request)
+        if profile is not None:
+            return await profile.get_response_async(request)
+        return await super().get_response_async(request)
+
+
+class SplitWSGIHandler(SplitMiddlewareMixin, WSGIHandler):
+    pass
+
+
+class SplitASGIHandler(SplitMiddlewareMixin, ASGIHandler):
+    pass
+
+
+def get_wsgi_application():
+    django.setup(set_prefix=False)
+    return SplitWSGIHandler()
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return SplitASGIHandler()
+
+
+class TimingProbe:
+    """
+    Pass-through middleware that times everything below it in the chain.
+
+    profile_middleware puts one between every pair of middleware; a layer's
+    own cost is its probe's time minus the next probe's. Instances register
+    in ``TimingProbe.instances`` in the order Django builds them, innermost
+    first.
+    """
+
+    instances = []
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.calls = 0
+        self.duration = 0.0
+        self.instances.append(self)
+
+    def __call__(self, request):
+        start = perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            self.calls += 1
+            self.duration += perf_counter() - start
+
+    def reset(self):
+        self.calls = 0
+        self.duration = 0.0
+
+    def wraps(self, other):
+        # Django wraps every layer in convert_exception_to_response; a layer
+        # that raised MiddlewareNotUsed leaves two probes next to each other
+        return getattr(self.get_response, '__wrapped__', None) is other
+
+
+def build_timed_profile(middleware):
+    """
+    Return ``(profile, probes)``: a MiddlewareProfile of ``middleware`` with
+    a TimingProbe before each entry and before the view, outermost first.
+    """
+    path = f'{TimingProbe.__module__}.{TimingProbe.__qualname__}'
+    timed = []
+    for entry in middleware:
+        timed += [path, entry]
+    timed.append(path)
+    TimingProbe.instances = []
+    profile = MiddlewareProfile(timed)
+    return profile, TimingProbe.instances[::-1]
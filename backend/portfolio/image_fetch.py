@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+
+CACHE_DIRNAME = 'image-cache'
+
+
+class ContentAddressedCache:
+    """
+    Store images under MEDIA_ROOT by the SHA-256 of their bytes.
+
+    An index maps source URLs to stored names, so re-seeding reuses files
+    without downloading or writing them again. Stored names are relative to
+    MEDIA_ROOT and can be assigned straight to an ImageField.
+    """
+
+    def __init__(self, root=None):
+        self.media_root = Path(root or settings.MEDIA_ROOT)
+        self.directory = self.media_root / CACHE_DIRNAME
+        self.index_path = self.directory / 'index.json'
+        self.lock = Lock()
+        try:
+            self.index = json.loads(self.index_path.read_text())
+        except (FileNotFoundError, ValueError):
+            self.index = {}
+
+    def lookup(self, url):
+        name = self.index.get(url)
+        if name and (self.media_root / name).exists():
+            return name
+        return None
+
+    def store(self, url, content, suffix='.jpg'):
+        digest = sha256(content).hexdigest()
+        name = f'{CACHE_DIRNAME}/{digest[:2]}/{digest}{suffix}'
+        path = self.media_root / name
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(path, content)
+        with self.lock:
+            self.index[url] = name
+        return name
+
+    def save_index(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            payload = json.dumps(self.index, indent=2, sort_keys=True).encode('utf-8')
+        self._atomic_write(self.index_path, payload)
+
+    @staticmethod
+    def _atomic_write(path, content):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                handle.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+class ImageFetcher:
+    """
+    Fetch many images concurrently through a ContentAddressedCache.
+
+    ``source`` makes fetching work offline: a local directory is searched
+    for the last path segment of each URL (with or without ``.jpg``), and an
+    ``http(s)://`` base URL replaces the scheme and host of every request,
+    e.g. to point at a local stand-in server.
+    """
+
+    def __init__(self, cache=None, source=None, workers=8, timeout=10, retries=3, backoff=0.5):
+        self.cache = cache or ContentAddressedCache()
+        self.source = source
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def fetch_all(self, urls):
+        """Return ``{url: stored name or None}`` for every URL."""
+        urls = list(dict.fromkeys(urls))
+        results = {url: self.cache.lookup(url) for url in urls}
+        missing = [url for url, name in results.items() if name is None]
+        if missing:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for url, name in zip(missing, pool.map(self.fetch, missing)):
+                    results[url] = name
+            self.cache.save_index()
+        return results
+
+    def fetch(self, url):
+        content = self.read(url)
+        if content is None:
+            return None
+        return self.cache.store(url, content)
+
+    def read(self, url):
+        if self.source and not self.source.startswith(('http://', 'https://')):
+            return self.read_local(url)
+        return self.download(self.rewrite(url))
+
+    def rewrite(self, url):
+        if not self.source:
+            return url
+        parts = urlsplit(url)
+        target = self.source.rstrip('/') + parts.path
+        return f'{target}?{parts.query}' if parts.query else target
+
+    def read_local(self, url):
+        stem = Path(urlsplit(url).path).name
+        for candidate in (stem, f'{stem}.jpg'):
+            path = Path(self.source) / candidate
+            if path.is_file():
+                return path.read_bytes()
+        return None
+
+    def download(self, url):
+        for attempt in range(self.retries):
+            try:
+                response = requests.get(url, timeout=self.timeout)
+            except requests.RequestException:
+                response = None
+            if response is not None and response.status_code == 200:
+                return response.content
+            # Client errors will not fix themselves on retry
+            if response is not None and 400 <= response.status_code < 500 and response.status_code != 429:
+                return None
+            if attempt + 1 < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        return None
@@ -0,0 +1,175 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+
+from .cache import invalidate_on_commit
+from .models import Employee, Project, Testimonial
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVES_DIR = 'derivatives'
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg'}
+PIL_FORMATS = {'avif': 'AVIF', 'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+IMAGE_MODELS = (Employee, Project, Testimonial)
+
+_executor = None
+
+
+def get_widths():
+    return tuple(getattr(settings, 'PORTFOLIO_IMAGE_WIDTHS', (320, 640, 1024)))
+
+
+@lru_cache
+def get_formats():
+    """Configured formats this Pillow build can encode, best first."""
+    from PIL import features
+
+    formats = []
+    for fmt in getattr(settings, 'PORTFOLIO_IMAGE_FORMATS', ('avif', 'webp', 'jpeg')):
+        try:
+            supported = fmt == 'jpeg' or features.check(fmt)
+        except ValueError:
+            supported = False
+        if supported:
+            formats.append(fmt)
+    return tuple(formats)
+
+
+@receiver(setting_changed)
+def reset_formats(setting, **kwargs):
+    if setting == 'PORTFOLIO_IMAGE_FORMATS':
+        get_formats.cache_clear()
+
+
+def derivative_dir(name):
+    return f'{DERIVATIVES_DIR}/{PurePosixPath(name).with_suffix("")}/'
+
+
+def derivative_name(name, width, fmt):
+    return f'{derivative_dir(name)}{width}w.{EXTENSIONS[fmt]}'
+
+
+def derivative_names(name):
+    return [
+        (width, fmt, derivative_name(name, width, fmt))
+        for fmt in get_formats()
+        for width in get_widths()
+    ]
+
+
+def derivatives_record(name):
+    """
+    The ``image_derivatives`` value of a model whose image is ``name`` once
+    every configured derivative of it is in storage. Srcsets are built from
+    this record alone, so they only ever list files that exist.
+    """
+    return {'source': name, 'widths': list(get_widths()), 'formats': list(get_formats())}
+
+
+def needs_derivatives(instance):
+    return bool(instance.image) and instance.image_derivatives != derivatives_record(instance.image.name)
+
+
+def record_derivatives(name):
+    record = derivatives_record(name)
+    for model in IMAGE_MODELS:
+        # update() sends no post_save, so nothing is scheduled again
+        if model.objects.filter(image=name).update(image_derivatives=record):
+            invalidate_on_commit(model)
+
+
+def generate_derivatives(name, force=False):
+    """
+    Write every width/format derivative of the image stored as ``name``,
+    then record them on the models that use it.
+
+    Sources narrower than a width are re-encoded at their own size, so every
+    width in the record exists. Returns the names that were written.
+    """
+    from PIL import Image, ImageOps
+
+    pending = [
+        (width, fmt, target) for width, fmt, target in derivative_names(name)
+        if force or not default_storage.exists(target)
+    ]
+    if not pending:
+        record_derivatives(name)
+        return []
+
+    with default_storage.open(name, 'rb') as handle:
+        source = ImageOps.exif_transpose(Image.open(handle))
+        source.load()
+    if source.mode not in ('RGB', 'RGBA'):
+        source = source.convert('RGBA' if 'transparency' in source.info else 'RGB')
+
+    written = []
+    resized = {}
+    for width, fmt, target in pending:
+        if width not in resized:
+            image = source.copy()
+            image.thumbnail((width, width * 10), Image.Resampling.LANCZOS)
+            resized[width] = image
+        image = resized[width]
+        if fmt == 'jpeg' and image.mode != 'RGB':
+            image = image.convert('RGB')
+        buffer = BytesIO()
+        image.save(buffer, PIL_FORMATS[fmt], quality=80)
+        if default_storage.exists(target):
+            default_storage.delete(target)
+        written.append(default_storage.save(target, ContentFile(buffer.getvalue())))
+    record_derivatives(name)
+    return written
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'PORTFOLIO_IMAGE_WORKERS', 2),
+            thread_name_prefix='image-derivatives',
+        )
+    return _executor
+
+
+def _generate_safely(name):
+    try:
+        generate_derivatives(name)
+    except Exception:
+        logger.exception('Could not generate derivatives for %s', name)
+
+
+def schedule_derivatives(name):
+    """Generate derivatives off the request thread once the save commits."""
+    if getattr(settings, 'PORTFOLIO_IMAGE_DERIVATIVES_SYNC', False):
+        transaction.on_commit(lambda: _generate_safely(name))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_generate_safely, name))
+
+
+def build_srcset(derivatives, request=None):
+    """
+    Return ``{format: 'url 320w, url 640w, ...'}`` for an ``image_derivatives``
+    record, or None while the derivatives are still being generated.
+    """
+    if not derivatives:
+        return None
+    # Resolve the derivative directory once; file names are plain ASCII so
+    # appending them gives the same URL storage.url() would
+    base = default_storage.url(derivative_dir(derivatives['source']))
+    if request is not None:
+        base = request.build_absolute_uri(base)
+    widths = derivatives['widths']
+    return {
+        fmt: ', '.join(f'{base}{width}w.{EXTENSIONS[fmt]} {width}w' for width in widths)
+        for fmt in derivatives['formats']
+    }
@@ -0,0 +1,210 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.mail import mail_admins
+from django.db import close_old_connections, transaction
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .cache import bump_model_version
+from .models import ContactMessage
+
+logger = logging.getLogger(__name__)
+
+# Sent with ``messages=[...]`` after a batch of queued messages is stored
+messages_ingested = Signal()
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ContactQueue:
+    """
+    Durable FIFO of validated contact messages in its own SQLite file.
+
+    The file runs in WAL mode, so request threads appending to it never wait
+    on the main database. Workers claim a batch, store it, then ack it; a
+    claim that is not acked within ``visibility_timeout`` seconds (a worker
+    died mid-batch) becomes claimable again.
+    """
+
+    def __init__(self, path, max_depth=1000, visibility_timeout=300):
+        self.path = Path(path)
+        self.max_depth = max_depth
+        self.visibility_timeout = visibility_timeout
+        self.local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS queue ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, ip TEXT, '
+                'enqueued_at REAL NOT NULL, claimed_at REAL)'
+            )
+            self.local.connection = connection
+        return connection
+
+    def put(self, payload, ip=None):
+        """Append a message and return its ticket id; raise QueueFull at max_depth."""
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            if self.depth() >= self.max_depth:
+                raise QueueFull
+            cursor = connection.execute(
+                'INSERT INTO queue (payload, ip, enqueued_at) VALUES (?, ?, ?)',
+                (json.dumps(payload), ip, time.time()),
+            )
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return cursor.lastrowid
+
+    def claim(self, limit):
+        """Return up to ``limit`` ``(id, payload, ip)`` rows and mark them claimed."""
+        connection = self.connection
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            rows = connection.execute(
+                'SELECT id, payload, ip FROM queue WHERE claimed_at IS NULL OR claimed_at < ? '
+                'ORDER BY id LIMIT ?',
+                (now - self.visibility_timeout, limit),
+            ).fetchall()
+            connection.executemany('UPDATE queue SET claimed_at = ? WHERE id = ?', [(now, row[0]) for row in rows])
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return [(pk, json.loads(payload), ip) for pk, payload, ip in rows]
+
+    def ack(self, ids):
+        self.connection.executemany('DELETE FROM queue WHERE id = ?', [(pk,) for pk in ids])
+
+    def depth(self):
+        return self.connection.execute('SELECT COUNT(*) FROM queue').fetchone()[0]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+_worker = None
+_wakeup = threading.Event()
+
+
+def get_queue():
+    global _queue
+    path = Path(getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_PATH', settings.BASE_DIR / 'queue' / 'contact.sqlite3'))
+    max_depth = getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_MAX_DEPTH', 1000)
+    visibility_timeout = getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_VISIBILITY_TIMEOUT', 300)
+    with _queue_lock:
+        if _queue is None or (_queue.path, _queue.max_depth, _queue.visibility_timeout) != (
+                path, max_depth, visibility_timeout):
+            _queue = ContactQueue(path, max_depth, visibility_timeout)
+        return _queue
+
+
+def contact_queue_enabled():
+    return getattr(settings, 'PORTFOLIO_CONTACT_QUEUE', True)
+
+
+def enqueue_message(data, ip=None):
+    """Queue validated serializer data for the worker and return a ticket id."""
+    ticket = get_queue().put(data, ip)
+    if getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_SYNC', False):
+        transaction.on_commit(drain)
+    else:
+        ensure_worker()
+        _wakeup.set()
+    return ticket
+
+
+def drain(batch_size=None):
+    """Store queued messages until the queue is empty; return how many were created."""
+    batch_size = batch_size or getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_BATCH_SIZE', 100)
+    queue = get_queue()
+    created = 0
+    while batch := queue.claim(batch_size):
+        created += len(store_batch(batch))
+        queue.ack([pk for pk, _, _ in batch])
+    return created
+
+
+def store_batch(batch):
+    """
+    Insert a claimed batch with one bulk_create, dropping messages that
+    repeat one already stored within PORTFOLIO_CONTACT_DEDUP_WINDOW seconds
+    or earlier in the same batch.
+    """
+    window = timedelta(seconds=getattr(settings, 'PORTFOLIO_CONTACT_DEDUP_WINDOW', 60 * 60 * 24))
+
+    def fingerprint(email, subject, message):
+        return email.lower(), subject.strip(), message.strip()
+
+    payloads = [payload for _, payload, _ in batch]
+    seen = {
+        fingerprint(*values)
+        for values in ContactMessage.objects.filter(
+            email__in={payload['email'] for payload in payloads},
+            created_at__gte=timezone.now() - window,
+        ).values_list('email', 'subject', 'message')
+    }
+    messages = []
+    for payload in payloads:
+        key = fingerprint(payload['email'], payload['subject'], payload['message'])
+        if key in seen:
+            continue
+        seen.add(key)
+        messages.append(ContactMessage(**payload))
+
+    if messages:
+        with transaction.atomic():
+            messages = ContactMessage.objects.bulk_create(messages)
+        # bulk_create sends no post_save, so invalidate here
+        bump_model_version(ContactMessage)
+        messages_ingested.send(sender=ContactMessage, messages=messages)
+    return messages
+
+
+def run_worker(poll_interval=1.0):
+    while True:
+        _wakeup.wait(poll_interval)
+        _wakeup.clear()
+        try:
+            drain()
+        except Exception:
+            logger.exception('Contact queue worker failed')
+        finally:
+            close_old_connections()
+
+
+def ensure_worker():
+    global _worker
+    with _queue_lock:
+        if _worker is None or not _worker.is_alive():
+            poll_interval = getattr(settings, 'PORTFOLIO_CONTACT_QUEUE_POLL_INTERVAL', 1.0)
+            _worker = threading.Thread(
+                target=run_worker, args=(poll_interval,), name='contact-queue', daemon=True,
+            )
+            _worker.start()
+
+
+@receiver(messages_ingested)
+def notify_admins(sender, messages, **kwargs):
+    if not getattr(settings, 'PORTFOLIO_CONTACT_NOTIFY_ADMINS', False):
+        return
+    lines = [f'{message.name} <{message.email}>: {message.subject}' for message in messages]
+    mail_admins(f'{len(messages)} new contact message(s)', '\n'.join(lines), fail_silently=True)
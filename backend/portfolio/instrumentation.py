@@ -0,0 +1,148 @@
+import atexit
+import json
+import logging
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+from time import perf_counter
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record and its ``extra`` fields as one JSON line."""
+
+    reserved = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record):
+        payload = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self.reserved:
+                payload[key] = value
+        return json.dumps(payload, default=str)
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    Hand records to a background thread that writes them to a stream.
+
+    The request thread only pays for a ``queue.put``; formatting and the
+    blocking write happen on the listener thread.
+    """
+
+    def __init__(self, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.target = logging.StreamHandler()
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+    def setFormatter(self, fmt):
+        # The listener thread formats, so the formatter belongs on the target
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Drop rather than block the request when the writer falls behind
+            pass
+
+
+class QueryTimer:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += perf_counter() - start
+
+
+def count_rows(response):
+    if response.status_code >= 400:
+        return 0
+    data = getattr(response, 'data', None)
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        results = data.get('results')
+        return len(results) if isinstance(results, list) else 1
+    return 0
+
+
+def start_measuring(request, timer):
+    """
+    Have timed_serialization and time_render add up the request's
+    serialization time in ``request._serialize_duration``.
+    """
+    if not hasattr(request, '_serialize_duration'):
+        request._serialize_duration = 0.0
+        request._query_timer = timer
+        request._serializing = False
+
+
+@contextmanager
+def timed_serialization(request):
+    """
+    Count the block, less the queries it runs, as serialization time for a
+    measured request; a no-op for any other, or inside another such block.
+    """
+    request = getattr(request, '_request', request)
+    timer = getattr(request, '_query_timer', None)
+    if timer is None or request._serializing:
+        yield
+        return
+    request._serializing = True
+    db = timer.duration
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        request._serialize_duration += perf_counter() - start - (timer.duration - db)
+        request._serializing = False
+
+
+def time_render(request, response):
+    """Count the time a TemplateResponse takes to render as serialization time."""
+    if getattr(request, '_render_timed', False) or not hasattr(request, '_serialize_duration'):
+        return
+    request._render_timed = True
+    start = perf_counter()
+
+    def finished(rendered):
+        request._serialize_duration += perf_counter() - start
+
+    response.add_post_render_callback(finished)
+
+
+class RequestTimings:
+    """Where one request's time went, in seconds."""
+
+    def __init__(self, total, timer, serialize=0.0, cache=None, size=None):
+        self.total = total
+        self.db = timer.duration
+        self.queries = timer.count
+        self.serialize = serialize
+        self.cache = cache
+        self.size = size
+
+    def server_timing(self):
+        parts = [
+            f'db;dur={self.db * 1000:.3f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize * 1000:.3f}',
+        ]
+        if self.cache:
+            parts.append(f'cache;desc="{self.cache}"')
+        parts.append(f'total;dur={self.total * 1000:.3f}')
+        return ', '.join(parts)
@@ -0,0 +1,216 @@
+import tracemalloc
+from statistics import mean, quantiles
+from time import perf_counter
+
+from django.db import connection
+from django.urls import URLResolver, reverse
+
+from .instrumentation import QueryTimer
+
+
+class Scenario:
+    """
+    One request shape to time: a named route from portfolio/urls.py, the
+    method, query parameters and body. ``pk`` names the sample object whose
+    primary key fills in a detail route; ``data`` may be a callable taking
+    the sample primary keys.
+    """
+
+    def __init__(self, name, route, method='get', pk=None, params=None, data=None, staff=False, status=200):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.pk = pk
+        self.params = params or {}
+        self.data = data
+        self.staff = staff
+        self.status = status
+
+    def path(self, pks):
+        return reverse(self.route, kwargs={'pk': pks[self.pk]} if self.pk else None)
+
+    def body(self, pks):
+        return self.data(pks) if callable(self.data) else self.data
+
+
+SCENARIOS = [
+    Scenario('api-root', 'api-root'),
+    Scenario('bundle', 'bundle'),
+    Scenario('search', 'search', params={'q': 'cloud'}),
+    Scenario('search-typed', 'search', params={'q': 'secure platform', 'type': 'project,service', 'limit': 50}),
+    Scenario('metrics', 'metrics', staff=True),
+
+    Scenario('services', 'service-list'),
+    Scenario('services-sparse', 'service-list', params={'fields': 'id,title'}),
+    Scenario('services-paged', 'service-list', params={'page': 1, 'page_size': 50}),
+    Scenario('service', 'service-detail', pk='service'),
+    Scenario('service-update', 'service-detail', 'patch', pk='service', data={'icon': 'faCloud'}, staff=True),
+
+    Scenario('employees', 'employee-list'),
+    Scenario('employees-department', 'employee-list', params={'department': 'DEVELOPMENT'}),
+    Scenario('employees-sparse', 'employee-list', params={'fields': 'id,name,designation'}),
+    Scenario('employee', 'employee-detail', pk='employee'),
+
+    Scenario('projects', 'project-list'),
+    Scenario('projects-status', 'project-list', params={'status': 'COMPLETED'}),
+    Scenario('projects-category', 'project-list', params={'category': 'Web Development'}),
+    Scenario('projects-paged', 'project-list', params={'page': 1, 'page_size': 50}),
+    Scenario('projects-cursor', 'project-list', params={'pagination': 'cursor', 'page_size': 50}),
+    Scenario('projects-sparse', 'project-list', params={'fields': 'id,title', 'expand': 'team_members'}),
+    Scenario('projects-stream', 'project-list', params={'stream': 1}),
+    Scenario('project', 'project-detail', pk='project'),
+    Scenario('project-update', 'project-detail', 'patch', pk='project', data={'client': 'Growth Co.'},
+             staff=True),
+    Scenario('project-assign', 'project-assign-team-member', 'post', pk='project',
+             data=lambda pks: {'employee_id': pks['employee']}, staff=True),
+    Scenario('project-remove', 'project-remove-team-member', 'post', pk='project',
+             data=lambda pks: {'employee_id': pks['employee']}, staff=True),
+    Scenario('project-team', 'project-update-team-members', 'post', pk='project',
+             data=lambda pks: {'add': pks['team']}, staff=True),
+
+    Scenario('contact-info', 'contactinformation-list'),
+    Scenario('contact-info-detail', 'contactinformation-detail', pk='contactinformation'),
+
+    Scenario('messages', 'contactmessage-list', staff=True),
+    Scenario('messages-cursor', 'contactmessage-list', params={'pagination': 'cursor'}, staff=True),
+    Scenario('message', 'contactmessage-detail', pk='contactmessage', staff=True),
+    Scenario('message-create', 'contactmessage-list', 'post', status=202, data={
+        'name': 'Load Test', 'email': 'load@example.com', 'subject': 'Hello', 'message': 'Benchmark message',
+    }),
+    Scenario('message-read', 'contactmessage-mark-as-read', 'post', pk='contactmessage', staff=True),
+    Scenario('message-status', 'contactmessage-update-status', 'post', pk='contactmessage',
+             data={'status': 'IN_PROGRESS'}, staff=True),
+    Scenario('messages-bulk', 'contactmessage-bulk-update', 'post',
+             data={'filter': {'status': 'NEW'}, 'is_read': True}, staff=True),
+
+    Scenario('testimonials', 'testimonial-list'),
+    Scenario('testimonials-rating', 'testimonial-list', params={'rating': 5}),
+    Scenario('testimonials-cursor', 'testimonial-list', params={'pagination': 'cursor'}),
+    Scenario('testimonial', 'testimonial-detail', pk='testimonial'),
+]
+for _prefix, _basename in [('services', 'service'), ('employees', 'employee'), ('projects', 'project'),
+                           ('contact-info', 'contactinformation'), ('testimonials', 'testimonial')]:
+    SCENARIOS += [
+        Scenario(f'async-{_prefix}', f'async-{_basename}-list'),
+        Scenario(f'async-{_basename}', f'async-{_basename}-detail', pk=_basename),
+    ]
+
+
+def route_names():
+    """Every named route in portfolio/urls.py."""
+    from . import urls
+
+    names = set()
+
+    def walk(patterns):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                walk(pattern.url_patterns)
+            elif pattern.name:
+                names.add(pattern.name)
+
+    walk(urls.urlpatterns)
+    return names
+
+
+def uncovered_routes(scenarios=SCENARIOS):
+    return sorted(route_names() - {scenario.route for scenario in scenarios})
+
+
+def run_scenario(client, scenario, pks, requests, warmup=5, memory_requests=5, headers=None):
+    """
+    Time ``requests`` sequential requests and return the scenario's results:
+    latency percentiles in milliseconds, throughput, queries per request,
+    peak traced memory over a separate ``memory_requests`` pass and the
+    number of responses with an unexpected status.
+    """
+    path = scenario.path(pks)
+    body = scenario.body(pks)
+    headers = dict(headers or {}) if scenario.staff else {}
+    call = getattr(client, scenario.method)
+    counter = [0]
+
+    def request():
+        # Each request from its own address so the contact form throttle stays out of the numbers
+        counter[0] += 1
+        address = f'10.{counter[0] >> 16 & 255}.{counter[0] >> 8 & 255}.{counter[0] & 255}'
+        if scenario.method == 'get':
+            return call(path, scenario.params, REMOTE_ADDR=address, **headers)
+        return call(path, body, content_type='application/json', REMOTE_ADDR=address, **headers)
+
+    for _ in range(warmup):
+        request()
+
+    timings, queries, errors = [], [], 0
+    started = perf_counter()
+    for _ in range(requests):
+        timer = QueryTimer()
+        start = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = request()
+            if response.streaming:
+                b''.join(response.streaming_content)
+        timings.append(perf_counter() - start)
+        queries.append(timer.count)
+        errors += response.status_code != scenario.status
+    elapsed = perf_counter() - started
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for _ in range(memory_requests):
+        response = request()
+        if response.streaming:
+            b''.join(response.streaming_content)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    if not tracing:
+        tracemalloc.stop()
+
+    return {
+        'method': scenario.method.upper(),
+        'path': path,
+        'params': scenario.params,
+        'requests': requests,
+        **latency_percentiles(timings),
+        'throughput_rps': round(requests / elapsed, 1) if elapsed else None,
+        'queries': round(mean(queries), 2) if queries else 0,
+        'peak_memory_kb': round(peak / 1024, 1),
+        'errors': errors,
+    }
+
+
+def latency_percentiles(timings):
+    if not timings:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    cuts = quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'p50_ms': round(cuts[49] * 1000, 3),
+        'p95_ms': round(cuts[94] * 1000, 3),
+        'p99_ms': round(cuts[98] * 1000, 3),
+    }
+
+
+def compare(results, baseline, tolerance=0.25, min_delta_ms=1.0):
+    """
+    Return a list of regression messages for ``results`` against ``baseline``
+    (both ``{'scenarios': {name: {...}}}``).
+
+    A scenario regresses when its p95 latency grows by more than
+    ``tolerance`` and by at least ``min_delta_ms``, when it runs more queries
+    per request, or when it returns unexpected statuses.
+    """
+    regressions = []
+    for name, result in results['scenarios'].items():
+        if result['errors']:
+            regressions.append(f'{name}: {result["errors"]} unexpected responses')
+        before = baseline.get('scenarios', {}).get(name)
+        if before is None:
+            continue
+        old, new = before['p95_ms'], result['p95_ms']
+        if old is not None and new is not None and new > old * (1 + tolerance) and new - old >= min_delta_ms:
+            regressions.append(f'{name}: p95 {old:.2f} ms -> {new:.2f} ms')
+        if result['queries'] > before['queries']:
+            regressions.append(f'{name}: {before["queries"]} -> {result["queries"]} queries per request')
+    return regressions
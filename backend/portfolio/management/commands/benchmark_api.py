@@ -0,0 +1,161 @@
+import json
+import platform
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+from portfolio.authentication import ClaimsTokenObtainPairSerializer
+from portfolio.loadtest import SCENARIOS, compare, run_scenario, uncovered_routes
+from portfolio.models import ContactMessage, Employee, Project, Service, Testimonial
+from portfolio.synthetic import SyntheticDataGenerator
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway dataset, time every route in portfolio/urls.py and '
+        'its filter variants in process, write p50/p95/p99 latency, '
+        'throughput, queries and peak memory to a JSON file, and fail if '
+        'any scenario regressed against the baseline.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--services', type=int, default=50)
+        parser.add_argument('--employees', type=int, default=200)
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--testimonials', type=int, default=500)
+        parser.add_argument('--messages', type=int, default=2000)
+        parser.add_argument('--team-size', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=100, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--memory-requests', type=int, default=5,
+                            help='Requests in the separate, traced pass that measures peak memory')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help='Only run scenarios with this name (repeatable)')
+        parser.add_argument('--output', default=str(settings.BASE_DIR / 'benchmarks' / 'results.json'))
+        parser.add_argument('--baseline', default=str(settings.BASE_DIR / 'benchmarks' / 'baseline.json'),
+                            help='Results file to compare against, when it exists')
+        parser.add_argument('--save-baseline', action='store_true', help='Also write the results as the baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 growth over the baseline, as a fraction')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                            help='Ignore p95 growth smaller than this, however large the fraction')
+
+    def handle(self, *args, **options):
+        missing = uncovered_routes()
+        if missing:
+            raise CommandError(f'No benchmark scenario for: {", ".join(missing)}')
+        scenarios = [s for s in SCENARIOS if not options['scenarios'] or s.name in options['scenarios']]
+        if not scenarios:
+            raise CommandError('No scenario matches --scenario')
+
+        results = {'meta': self.meta(options), 'scenarios': {}}
+        # Contact form posts go to a scratch queue and are drained on commit,
+        # which never comes
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            PORTFOLIO_CONTACT_QUEUE_PATH=Path(directory) / 'contact.sqlite3',
+            PORTFOLIO_CONTACT_QUEUE_SYNC=True,
+            PORTFOLIO_CONTACT_QUEUE_MAX_DEPTH=10 ** 9,
+        ):
+            try:
+                with transaction.atomic():
+                    pks, token = self.seed(options)
+                    client = Client()
+                    headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+                    self.stdout.write(
+                        f'\n{"scenario":<24} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"req/s":>9} '
+                        f'{"queries":>8} {"peak KB":>9}'
+                    )
+                    for scenario in scenarios:
+                        result = run_scenario(
+                            client, scenario, pks, options['requests'], options['warmup'],
+                            options['memory_requests'], headers,
+                        )
+                        results['scenarios'][scenario.name] = result
+                        self.report(scenario.name, result)
+                    raise Rollback
+            except Rollback:
+                pass
+        # The rolled back rows may still back cached responses
+        cache.clear()
+
+        self.write(options['output'], results)
+        if options['save_baseline']:
+            self.write(options['baseline'], results)
+
+        baseline_path = Path(options['baseline'])
+        if options['save_baseline'] or not baseline_path.exists():
+            regressions = compare(results, {}, options['tolerance'], options['min_delta_ms'])
+        else:
+            baseline = json.loads(baseline_path.read_text())
+            if baseline.get('meta', {}).get('dataset') != results['meta']['dataset']:
+                raise CommandError(
+                    f'{baseline_path} was recorded on a different dataset: '
+                    f'{baseline.get("meta", {}).get("dataset")}'
+                )
+            regressions = compare(results, baseline, options['tolerance'], options['min_delta_ms'])
+            self.stdout.write(f'\nCompared with {baseline_path}')
+        if regressions:
+            raise CommandError('Benchmark regressions:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions'))
+
+    def seed(self, options):
+        generator = SyntheticDataGenerator(seed=options['seed'])
+        generator.services(options['services'])
+        employee_pks = generator.employees(options['employees'])
+        generator.projects(options['projects'], employee_pks, options['team_size'])
+        generator.testimonials(options['testimonials'])
+        generator.messages(options['messages'])
+        contact_info = generator.contact_info()
+        models = [Service, Employee, Project, Testimonial, ContactMessage]
+        generator.spread_created_at([Project, Testimonial, ContactMessage])
+        generator.invalidate(models)
+
+        staff = User.objects.create_user('benchmark-staff', is_staff=True)
+        token = ClaimsTokenObtainPairSerializer.get_token(staff).access_token
+        pks = {model._meta.model_name: model.objects.order_by('-pk').values_list('pk', flat=True).first()
+               for model in models}
+        pks['employee'] = Employee.objects.filter(is_active=True).order_by('-pk').values_list('pk', flat=True)[0]
+        pks['testimonial'] = Testimonial.objects.filter(is_active=True).order_by('-pk').values_list(
+            'pk', flat=True)[0]
+        pks['contactinformation'] = contact_info.pk
+        pks['team'] = employee_pks[:5]
+        return pks, token
+
+    def meta(self, options):
+        return {
+            'created': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'dataset': {name: options[name] for name in (
+                'services', 'employees', 'projects', 'testimonials', 'messages', 'team_size', 'seed',
+            )},
+            'requests': options['requests'],
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f'{name:<24} {result["p50_ms"]:>9.2f} {result["p95_ms"]:>9.2f} {result["p99_ms"]:>9.2f} '
+            f'{result["throughput_rps"]:>9.0f} {result["queries"]:>8} {result["peak_memory_kb"]:>9.0f}'
+            + (self.style.ERROR(f'   {result["errors"]} unexpected responses') if result['errors'] else '')
+        )
+
+    def write(self, path, results):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2) + '\n')
+        self.stdout.write(f'Wrote {path}')
@@ -0,0 +1,133 @@
+import asyncio
+import importlib.util
+import json
+import socket
+import subprocess
+import sys
+from statistics import quantiles
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test one WSGI worker against one ASGI worker on the current '
+        'database: the sync viewset under WSGI, the same viewset under ASGI, '
+        'and the async read view under ASGI, at increasing concurrency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/projects/', help='Sync endpoint to load')
+        parser.add_argument('--async-path', default='/api/async/projects/', help='Matching async endpoint')
+        parser.add_argument('--concurrency', default='1,8,32,128', help='Comma-separated client counts')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per concurrency level')
+        parser.add_argument('--threads', type=int, default=8, help='Threads for the WSGI worker (gunicorn)')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec('uvicorn') is None:
+            raise CommandError('uvicorn is required for the ASGI runs (pip install uvicorn)')
+        self.port = options['port']
+        levels = [int(level) for level in options['concurrency'].split(',')]
+        if settings.DEBUG:
+            self.stderr.write('DEBUG is on; numbers include query logging and budget checks')
+
+        modes = [
+            ('wsgi', self.wsgi_command(options['threads']), options['path']),
+            ('asgi-sync', self.asgi_command(), options['path']),
+            ('asgi-async', self.asgi_command(), options['async_path']),
+        ]
+        results = {}
+        for mode, command, path in modes:
+            self.stdout.write(f'\n{mode}: {path}')
+            server = self.start(command)
+            try:
+                results[mode] = []
+                for concurrency in levels:
+                    result = asyncio.run(self.load(path, concurrency, options['duration']))
+                    results[mode].append(result)
+                    self.stdout.write(
+                        f'  c={concurrency:<4} {result["rps"]:>8.1f} req/s   p50 {result["p50_ms"]:>7.2f}   '
+                        f'p95 {result["p95_ms"]:>7.2f}   p99 {result["p99_ms"]:>7.2f} ms   '
+                        f'errors {result["errors"]}'
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+    def wsgi_command(self, threads):
+        if importlib.util.find_spec('gunicorn') is not None:
+            return [sys.executable, '-m', 'gunicorn', 'core.wsgi:application', '--workers', '1',
+                    '--threads', str(threads), '--bind', f'127.0.0.1:{self.port}', '--log-level', 'warning']
+        # runserver is a single threaded-WSGI process too
+        return [sys.executable, 'manage.py', 'runserver', f'127.0.0.1:{self.port}', '--noreload']
+
+    def asgi_command(self):
+        return [sys.executable, '-m', 'uvicorn', 'core.asgi:application', '--workers', '1',
+                '--host', '127.0.0.1', '--port', str(self.port), '--log-level', 'warning', '--no-access-log']
+
+    def start(self, command):
+        server = subprocess.Popen(command, cwd=settings.BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = perf_counter() + 20
+        while perf_counter() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f'Server exited: {" ".join(command)}')
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.2).close()
+                return server
+            except OSError:
+                sleep(0.1)
+        server.terminate()
+        raise CommandError(f'Server did not start: {" ".join(command)}')
+
+    async def load(self, path, concurrency, duration):
+        # Warm the response cache and connections before measuring
+        await self.request(path)
+        latencies = []
+        errors = 0
+        stop = perf_counter() + duration
+
+        async def client():
+            nonlocal errors
+            while perf_counter() < stop:
+                start = perf_counter()
+                try:
+                    status = await self.request(path)
+                except OSError:
+                    status = None
+                if status == 200:
+                    latencies.append(perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = perf_counter() - started
+        cuts = quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+        return {
+            'concurrency': concurrency,
+            'requests': len(latencies),
+            'errors': errors,
+            'rps': len(latencies) / elapsed,
+            'p50_ms': cuts[49] * 1000,
+            'p95_ms': cuts[94] * 1000,
+            'p99_ms': cuts[98] * 1000,
+        }
+
+    async def request(self, path):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
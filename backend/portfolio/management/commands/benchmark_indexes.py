@@ -0,0 +1,105 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from portfolio.models import Employee, Project, ContactMessage, Testimonial
+from portfolio.synthetic import SyntheticDataGenerator
+
+BATCH_SIZE = 2000
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large throwaway dataset and compare query plans and latency '
+        'of the API access paths with and without the portfolio indexes. '
+        'Everything runs in one transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000,
+                            help='Rows per model (default: 100000)')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Timed runs per query (default: 20)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('EXPLAIN QUERY PLAN reporting requires SQLite')
+        self.random_seed = options['seed']
+        self.repeat = options['repeat']
+
+        # SQLite can only alter indexes inside a transaction with FK checks off
+        connection.disable_constraint_checking()
+        try:
+            with transaction.atomic():
+                self.seed(options['rows'])
+                models = (Employee, Project, ContactMessage, Testimonial)
+                indexes = [(model, index) for model in models for index in model._meta.indexes]
+
+                with connection.schema_editor(atomic=False) as editor:
+                    for model, index in indexes:
+                        editor.remove_index(model, index)
+                before = self.measure('without indexes')
+
+                with connection.schema_editor(atomic=False) as editor:
+                    for model, index in indexes:
+                        editor.add_index(model, index)
+                after = self.measure('with indexes')
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            connection.enable_constraint_checking()
+
+        self.stdout.write('\nSummary (median ms)')
+        for label in before:
+            speedup = before[label] / after[label] if after[label] else float('inf')
+            self.stdout.write(
+                f'  {label:<32} {before[label]:>9.3f} -> {after[label]:>9.3f}  ({speedup:.1f}x)'
+            )
+
+    def seed(self, rows):
+        self.stdout.write(f'Seeding {rows} rows per model...')
+        generator = SyntheticDataGenerator(seed=self.random_seed, batch_size=BATCH_SIZE)
+        generator.employees(rows)
+        generator.projects(rows, team_size=0)
+        generator.messages(rows)
+        generator.testimonials(rows)
+        generator.spread_created_at([Project, ContactMessage, Testimonial])
+
+    def access_paths(self):
+        return {
+            'employees?department': Employee.objects.filter(is_active=True, department='DEVELOPMENT'),
+            'employees': Employee.objects.filter(is_active=True),
+            'projects?status': Project.objects.filter(status='ONGOING'),
+            'projects?category': Project.objects.filter(category='UI/UX Design'),
+            'projects cursor page': Project.objects.order_by('-created_at', '-id'),
+            'testimonials?rating': Testimonial.objects.filter(is_active=True, rating=5),
+            'testimonials cursor page': Testimonial.objects.filter(is_active=True).order_by('-created_at', '-id'),
+            'contact-messages?status': ContactMessage.objects.filter(status='NEW'),
+            'contact-messages unread': ContactMessage.objects.filter(is_read=False),
+        }
+
+    def measure(self, phase):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{phase}'))
+        medians = {}
+        for label, queryset in self.access_paths().items():
+            page = queryset[:10]
+            plan = page.explain()
+            timings = []
+            for _ in range(self.repeat):
+                start = perf_counter()
+                list(page.all())
+                timings.append((perf_counter() - start) * 1000)
+            timings.sort()
+            medians[label] = timings[len(timings) // 2]
+            self.stdout.write(f'{label}: {medians[label]:.3f} ms')
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+        return medians
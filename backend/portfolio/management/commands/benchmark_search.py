@@ -0,0 +1,83 @@
+from functools import reduce
+from operator import and_, or_
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from portfolio.search import SEARCH_TYPES, rebuild_index, search_pks
+from portfolio.synthetic import SyntheticDataGenerator
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the FTS5 search index with the LIKE scans admin search_fields '
+        'used to run, on a throwaway synthetic dataset.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=20000)
+        parser.add_argument('--employees', type=int, default=5000)
+        parser.add_argument('--testimonials', type=int, default=5000)
+        parser.add_argument('--services', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--query', action='append', dest='queries',
+                            help='Search text to time (repeatable)')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        queries = options['queries'] or ['Khan', 'secure', 'cloud strategy', 'perf', 'scalable mobile experience']
+        try:
+            with transaction.atomic():
+                generator = SyntheticDataGenerator(seed=options['seed'])
+                generator.services(options['services'])
+                employee_pks = generator.employees(options['employees'])
+                generator.projects(options['projects'], employee_pks)
+                generator.testimonials(options['testimonials'])
+                start = perf_counter()
+                rebuild_index()
+                self.stdout.write(f'Indexed in {perf_counter() - start:.2f}s')
+
+                self.stdout.write(f'\n{"query":<28} {"LIKE ms":>10} {"FTS5 ms":>10} {"speedup":>8}   matches')
+                for query in queries:
+                    like_ms, like_hits = self.time(lambda: self.like(query))
+                    fts_ms, fts_hits = self.time(lambda: self.fts(query))
+                    self.stdout.write(
+                        f'{query:<28} {like_ms:>10.2f} {fts_ms:>10.2f} {like_ms / max(fts_ms, 1e-6):>7.1f}x   '
+                        f'{like_hits} LIKE / {fts_hits} FTS5'
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def time(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            start = perf_counter()
+            output = func()
+            timings.append((perf_counter() - start) * 1000)
+        timings.sort()
+        return timings[len(timings) // 2], output
+
+    def like(self, query):
+        # What ModelAdmin.get_search_results did: every word in some field
+        hits = 0
+        for _, model, title_fields, body_fields, _ in SEARCH_TYPES.values():
+            fields = title_fields + body_fields
+            condition = reduce(and_, [
+                reduce(or_, [Q(**{f'{field}__icontains': word}) for field in fields])
+                for word in query.split()
+            ])
+            hits += len(list(model.objects.filter(condition).values_list('pk', flat=True)))
+        return hits
+
+    def fts(self, query):
+        return sum(
+            len(model.objects.filter(pk__in=search_pks(model, query)).values_list('pk', flat=True))
+            for _, model, *_ in SEARCH_TYPES.values()
+        )
@@ -0,0 +1,84 @@
+from time import perf_counter
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from portfolio.fast import get_plan
+from portfolio.models import Employee, Project
+from portfolio.renderers import FastJSONRenderer
+from portfolio.serializers import EmployeeSerializer, ProjectSerializer
+from portfolio.synthetic import SyntheticDataGenerator
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the DRF serializer read path with the precompiled fast path '
+        'for project and employee lists on a throwaway dataset.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=2000)
+        parser.add_argument('--employees', type=int, default=500)
+        parser.add_argument('--team-size', type=int, default=4)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.request = RequestFactory().get('/api/', HTTP_HOST='localhost')
+        try:
+            with transaction.atomic():
+                generator = SyntheticDataGenerator(seed=options['seed'])
+                employee_pks = generator.employees(options['employees'])
+                generator.projects(options['projects'], employee_pks, options['team_size'])
+                results = [
+                    self.compare(
+                        'projects',
+                        ProjectSerializer,
+                        Project.objects.prefetch_related(
+                            Prefetch('team_members', queryset=Employee.objects.order_by('name', 'id'))
+                        ),
+                    ),
+                    self.compare('employees', EmployeeSerializer, Employee.objects.filter(is_active=True)),
+                ]
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write('\nSummary (median ms)')
+        for label, drf, fast in results:
+            self.stdout.write(f'  {label:<10} DRF {drf:>9.2f}   fast {fast:>9.2f}   ({drf / fast:.1f}x)')
+
+    def time(self, func):
+        timings = []
+        for _ in range(self.repeat):
+            start = perf_counter()
+            output = func()
+            timings.append((perf_counter() - start) * 1000)
+        timings.sort()
+        return timings[len(timings) // 2], output
+
+    def compare(self, label, serializer_class, queryset):
+        plan = get_plan(serializer_class)
+        if plan is None:
+            raise CommandError(f'{serializer_class.__name__} is not supported by the fast path')
+
+        def drf():
+            data = serializer_class(queryset.all(), many=True, context={'request': self.request}).data
+            return JSONRenderer().render(data)
+
+        def fast():
+            return FastJSONRenderer().render(plan.run(queryset.all(), self.request))
+
+        drf_ms, expected = self.time(drf)
+        fast_ms, actual = self.time(fast)
+        if actual != expected:
+            raise CommandError(f'{label}: fast path output differs from the serializer output')
+        self.stdout.write(f'{label}: {len(expected)} bytes, DRF {drf_ms:.2f} ms, fast {fast_ms:.2f} ms')
+        return label, drf_ms, fast_ms
@@ -0,0 +1,160 @@
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from portfolio.models import Employee, Project
+
+
+class Profile:
+    """How a worker thread opens and uses its SQLite connections."""
+
+    def __init__(self, name, persistent, init_command='', timeout=5.0, immediate=False, read_only=False):
+        self.name = name
+        self.persistent = persistent
+        self.init_command = init_command
+        self.timeout = timeout
+        self.immediate = immediate
+        self.read_only = read_only
+
+    def connect(self, path, read_only=False):
+        uri = f'file:{path}?mode=ro' if read_only else f'file:{path}'
+        conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+        for command in self.init_command.split(';'):
+            if command.strip() and not (read_only and 'journal_mode' in command):
+                conn.execute(command)
+        return conn
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare SQLite connection profiles under concurrent API-style reads '
+        'and writes on a copy of the database: per-request connections with '
+        'the rollback journal, the tuned WAL profile from settings, and the '
+        'tuned profile with reads on a read-only connection.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile')
+        parser.add_argument('--write-ratio', type=float, default=0.2)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        db_options = settings.DATABASES['default'].get('OPTIONS', {})
+        tuned = dict(
+            persistent=True,
+            init_command=db_options.get('init_command', ''),
+            timeout=db_options.get('timeout', 5.0),
+            immediate=db_options.get('transaction_mode') == 'IMMEDIATE',
+        )
+        profiles = [
+            Profile('per-request', persistent=False, init_command='PRAGMA journal_mode=DELETE'),
+            Profile('tuned', **tuned),
+            Profile('tuned-readonly', read_only=True, **tuned),
+        ]
+        self.reads = [
+            Project.objects.all().query.sql_with_params(),
+            Employee.objects.filter(is_active=True).query.sql_with_params(),
+        ]
+        self.options = options
+
+        with tempfile.TemporaryDirectory() as directory:
+            for profile in profiles:
+                path = Path(directory) / f'{profile.name}.sqlite3'
+                self.copy_database(path)
+                result = self.run(profile, path)
+                self.stdout.write(
+                    f'{profile.name:<15} reads {result["reads"] / result["elapsed"]:>8.0f}/s '
+                    f'(p95 {result["read_p95_ms"]:>6.2f} ms)   writes {result["writes"] / result["elapsed"]:>6.0f}/s '
+                    f'(p95 {result["write_p95_ms"]:>7.2f} ms)   locked errors {result["errors"]}'
+                )
+
+    def copy_database(self, path):
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        connection.connection.backup(target)
+        target.close()
+
+    def run(self, profile, path):
+        stop = perf_counter() + self.options['duration']
+        results = {'reads': [], 'writes': [], 'errors': 0}
+        lock = threading.Lock()
+        project_pks = [pk for (pk,) in sqlite3.connect(path).execute('SELECT id FROM portfolio_project')] or [0]
+
+        def worker(index):
+            rng = Random(self.options['seed'] + index)
+            reads, writes, errors = [], [], 0
+            writer = reader = None
+            if profile.persistent:
+                writer = profile.connect(path)
+                reader = profile.connect(path, read_only=True) if profile.read_only else writer
+            while perf_counter() < stop:
+                is_write = rng.random() < self.options['write_ratio']
+                start = perf_counter()
+                conn = None
+                try:
+                    if profile.persistent:
+                        conn = writer if is_write else reader
+                    else:
+                        conn = profile.connect(path)
+                    if is_write:
+                        self.write(conn, profile, rng.choice(project_pks))
+                    else:
+                        sql, params = rng.choice(self.reads)
+                        conn.execute(sql, params).fetchall()
+                    (writes if is_write else reads).append(perf_counter() - start)
+                except sqlite3.OperationalError as exc:
+                    if 'locked' not in str(exc):
+                        raise
+                    errors += 1
+                finally:
+                    if conn is not None and not profile.persistent:
+                        conn.close()
+            with lock:
+                results['reads'] += reads
+                results['writes'] += writes
+                results['errors'] += errors
+
+        started = perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = perf_counter() - started
+
+        def p95(timings):
+            return quantiles(timings, n=20)[18] * 1000 if len(timings) > 1 else 0.0
+
+        return {
+            'elapsed': elapsed,
+            'reads': len(results['reads']),
+            'writes': len(results['writes']),
+            'errors': results['errors'],
+            'read_p95_ms': p95(results['reads']),
+            'write_p95_ms': p95(results['writes']),
+        }
+
+    def write(self, conn, profile, project_pk):
+        # A contact message plus a project touch, like a form post and an admin edit
+        now = timezone.now().isoformat(' ')
+        conn.execute('BEGIN IMMEDIATE' if profile.immediate else 'BEGIN')
+        try:
+            conn.execute(
+                'INSERT INTO portfolio_contactmessage (name, email, subject, message, status, is_read, '
+                'created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                ('Load', 'load@example.com', 'Benchmark', 'Hello', 'NEW', False, now, now),
+            )
+            conn.execute('UPDATE portfolio_project SET updated_at = ? WHERE id = ?', (now, project_pk))
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
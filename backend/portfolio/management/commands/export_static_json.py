@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from portfolio import static_export
+
+
+class Command(BaseCommand):
+    help = 'Render every public API endpoint to pre-compressed static JSON files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--root', help='Export directory (default: PORTFOLIO_STATIC_EXPORT_ROOT)')
+        parser.add_argument('--base-url', help='Scheme and host used for absolute media URLs')
+        parser.add_argument('--keep', type=int, default=3, help='Number of releases to keep')
+
+    def handle(self, *args, **options):
+        if static_export.brotli is None:
+            self.stderr.write('brotli is not installed; writing gzip variants only')
+        release, manifest = static_export.export_static_json(
+            root=options['root'], base_url=options['base_url'], keep=options['keep'],
+        )
+        size = sum(entry['size'] for entry in manifest.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {len(manifest)} URLs ({size} bytes uncompressed) to {release}'
+        ))
@@ -0,0 +1,38 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from portfolio.images import generate_derivatives
+from portfolio.models import Employee, Project, Testimonial
+
+
+class Command(BaseCommand):
+    help = 'Backfill responsive image derivatives, and the records srcsets are built from, for existing media'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenerate derivatives that already exist')
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        names = set()
+        for model in (Employee, Project, Testimonial):
+            names.update(model.objects.exclude(image='').values_list('image', flat=True).distinct())
+
+        self.stdout.write(f'Processing {len(names)} images...')
+        written = failed = 0
+
+        def process(name):
+            return generate_derivatives(name, force=options['force'])
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            futures = {name: pool.submit(process, name) for name in sorted(names)}
+            for name, future in futures.items():
+                try:
+                    written += len(future.result())
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f'  {name}: {exc}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} derivatives ({failed} images failed)'
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from portfolio.ingest import drain, get_queue, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Store queued contact form submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit')
+        parser.add_argument('--poll-interval', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        if options['once']:
+            created = drain()
+            self.stdout.write(self.style.SUCCESS(
+                f'Stored {created} messages ({get_queue().depth()} left in queue)'
+            ))
+            return
+        self.stdout.write(f'Processing {get_queue().path} (Ctrl+C to stop)...')
+        run_worker(options['poll_interval'])
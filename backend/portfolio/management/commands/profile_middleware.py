@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from portfolio.handlers import build_timed_profile
+
+
+class Command(BaseCommand):
+    help = (
+        'Report what each middleware layer costs per request, for the full '
+        'MIDDLEWARE chain and the lean PORTFOLIO_API_MIDDLEWARE chain.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per path and chain')
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request (repeatable)')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or ['/api/services/', '/api/projects/', '/admin/login/']
+        api_middleware = getattr(settings, 'PORTFOLIO_API_MIDDLEWARE', None)
+        api_prefixes = tuple(getattr(settings, 'PORTFOLIO_API_PREFIXES', ('/api/',)))
+        factory = RequestFactory(HTTP_HOST='localhost')
+
+        for path in paths:
+            self.stdout.write(f'\n{path}')
+            # Only API paths are ever served by the lean chain
+            chains = [('full', settings.MIDDLEWARE)]
+            if api_middleware is not None and path.startswith(api_prefixes):
+                chains.append(('api', api_middleware))
+            reports = {name: self.measure(middleware, factory, path, options) for name, middleware in chains}
+            names = [name for name, _ in chains]
+            self.stdout.write(f'  {"layer":<56}' + ''.join(f'{name + " µs":>12}' for name in names))
+            layers = []
+            for name in names:
+                layers += [layer for layer in reports[name] if layer not in layers]
+            for layer in layers:
+                cells = ''.join(f'{self.cell(reports[name].get(layer, "-")):>12}' for name in names)
+                self.stdout.write(f'  {layer:<56}{cells}')
+
+    def measure(self, middleware, factory, path, options):
+        """Mean microseconds per request spent in each layer, plus the view and the total."""
+        profile, probes = build_timed_profile(middleware)
+        for _ in range(options['warmup']):
+            profile.get_response(factory.get(path)).close()
+        for probe in probes:
+            probe.reset()
+        for _ in range(options['requests']):
+            profile.get_response(factory.get(path)).close()
+
+        calls = max(probes[0].calls, 1)
+        report = {}
+        for entry, probe, inner in zip(middleware, probes, probes[1:]):
+            report[entry] = None if probe.wraps(inner) else (probe.duration - inner.duration) / calls * 1e6
+        report['(url resolution and view)'] = probes[-1].duration / calls * 1e6
+        report['total'] = probes[0].duration / calls * 1e6
+        return report
+
+    def cell(self, value):
+        if value is None:
+            return 'not used'
+        if isinstance(value, str):
+            return value
+        return f'{value:.1f}'
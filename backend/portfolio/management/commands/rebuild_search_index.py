@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from portfolio.search import TABLE, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the database'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_index()
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {TABLE}')
+            count = cursor.fetchone()[0]
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} rows'))
@@ -1,13 +1,35 @@
 from django.core.management.base import BaseCommand
-from django.core.files.base import ContentFile
-from portfolio.models import Service, Employee, Project, ContactInformation, Testimonial
-import requests
+from django.db import transaction
+from portfolio.models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
+from portfolio.image_fetch import ImageFetcher
+from portfolio.synthetic import SyntheticDataGenerator
 from datetime import date, timedelta
 
 class Command(BaseCommand):
     help = 'Seed database with initial data'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', action='store_true',
+                            help='Generate fake data at scale instead of the demo content')
+        parser.add_argument('--services', type=int, default=20)
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--projects', type=int, default=5000)
+        parser.add_argument('--team-size', type=int, default=3)
+        parser.add_argument('--testimonials', type=int, default=500)
+        parser.add_argument('--messages', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Random seed; the same seed gives the same data')
+        parser.add_argument('--image-source',
+                            help='Local directory or base URL to fetch demo images from')
+        parser.add_argument('--image-workers', type=int, default=8)
+        parser.add_argument('--image-timeout', type=float, default=10)
+        parser.add_argument('--image-retries', type=int, default=3)
+
+    def handle(self, *args, **options):
+        if options['synthetic']:
+            return self.seed_synthetic(options)
+
         self.stdout.write('Seeding data...')
         
         # Clear existing data
@@ -107,21 +129,6 @@ class Command(BaseCommand):
             },
         ]
 
-        created_employees = []
-        for employee_data in employees:
-            image_url = employee_data.pop('image_url')
-            response = requests.get(f"{image_url}?w=800&q=80")
-            if response.status_code == 200:
-                employee = Employee(**employee_data)
-                employee.image.save(
-                    f"{employee_data['name'].lower().replace(' ', '_')}.jpg",
-                    ContentFile(response.content),
-                    save=True
-                )
-                created_employees.append(employee)
-        self.stdout.write(self.style.SUCCESS('Employees created successfully'))
-
-        # Seed Projects
         projects = [
             {
                 'title': 'E-commerce Platform',
@@ -158,16 +165,38 @@ class Command(BaseCommand):
             },
         ]
 
+        # Fetch every image up front, concurrently and through the local cache
+        for employee_data in employees:
+            employee_data['image_url'] += '?w=800&q=80'
+        for project_data in projects:
+            project_data['image_url'] += '?w=1200&q=80'
+        fetcher = ImageFetcher(
+            source=options['image_source'],
+            workers=options['image_workers'],
+            timeout=options['image_timeout'],
+            retries=options['image_retries'],
+        )
+        images = fetcher.fetch_all(
+            [data['image_url'] for data in employees + projects]
+        )
+
+        created_employees = []
+        for employee_data in employees:
+            image = images[employee_data.pop('image_url')]
+            if image:
+                employee = Employee(**employee_data)
+                employee.image.name = image
+                employee.save()
+                created_employees.append(employee)
+        self.stdout.write(self.style.SUCCESS('Employees created successfully'))
+
+        # Seed Projects
         for project_data in projects:
-            image_url = project_data.pop('image_url')
-            response = requests.get(f"{image_url}?w=1200&q=80")
-            if response.status_code == 200:
+            image = images[project_data.pop('image_url')]
+            if image:
                 project = Project(**project_data)
-                project.image.save(
-                    f"{project_data['title'].lower().replace(' ', '_')}.jpg",
-                    ContentFile(response.content),
-                    save=True
-                )
+                project.image.name = image
+                project.save()
                 # Assign random team members
                 project.team_members.add(*created_employees[:2])
         self.stdout.write(self.style.SUCCESS('Projects created successfully'))
@@ -217,3 +246,32 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Testimonials created successfully'))
 
         self.stdout.write(self.style.SUCCESS('All data seeded successfully'))
+
+    def seed_synthetic(self, options):
+        def progress(label, done, total):
+            self.stdout.write(f'  {label}: {done}/{total}')
+
+        generator = SyntheticDataGenerator(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            progress=progress,
+        )
+        models = [Service, Employee, Project, ContactInformation, Testimonial]
+        if options['messages']:
+            models.append(ContactMessage)
+
+        self.stdout.write('Seeding synthetic data...')
+        with transaction.atomic():
+            generator.clear(models)
+            generator.services(options['services'])
+            employee_pks = generator.employees(options['employees'])
+            generator.projects(options['projects'], employee_pks, options['team_size'])
+            generator.testimonials(options['testimonials'])
+            if options['messages']:
+                generator.messages(options['messages'])
+            generator.contact_info()
+            # Only re-date tables this run rebuilt; real contact messages stay as they are
+            generator.spread_created_at([m for m in (Service, Project, Testimonial, ContactMessage) if m in models])
+        generator.invalidate(models)
+
+        self.stdout.write(self.style.SUCCESS('All data seeded successfully'))
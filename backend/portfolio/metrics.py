@@ -0,0 +1,111 @@
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# name -> (help, buckets); every histogram is labelled by view and action
+HISTOGRAMS = {
+    'portfolio_request_duration_seconds': ('Time spent in the middleware chain and view', TIME_BUCKETS),
+    'portfolio_request_db_seconds': ('Time spent executing database queries', TIME_BUCKETS),
+    'portfolio_request_queries': ('Database queries per request', QUERY_BUCKETS),
+    'portfolio_request_serialize_seconds': ('Time spent serializing and rendering outside the database',
+                                            TIME_BUCKETS),
+    'portfolio_response_size_bytes': ('Response body size, after compression', SIZE_BUCKETS),
+}
+COUNTERS = {
+    'portfolio_requests_total': 'Requests by view, action and status class',
+    'portfolio_response_cache_total': 'Response cache lookups by view, action and result',
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            total += count
+            yield bound, total
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return ','.join(f'{name}="{escape(value)}"' for name, value in labels.items())
+
+
+class Metrics:
+    """
+    In-process request metrics, rendered in the Prometheus text format.
+
+    One lock acquisition per request; each worker process keeps and serves
+    its own numbers.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = Counter()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = Counter()
+
+    def observe(self, view, action, status, timings):
+        """Record one request; ``timings`` is a RequestTimings."""
+        values = {
+            'portfolio_request_duration_seconds': timings.total,
+            'portfolio_request_db_seconds': timings.db,
+            'portfolio_request_queries': timings.queries,
+            'portfolio_request_serialize_seconds': timings.serialize,
+        }
+        if timings.size is not None:
+            values['portfolio_response_size_bytes'] = timings.size
+        with self.lock:
+            for name, value in values.items():
+                key = (name, view, action)
+                histogram = self.histograms.get(key)
+                if histogram is None:
+                    histogram = self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                histogram.observe(value)
+            self.counters['portfolio_requests_total', view, action, f'{status // 100}xx'] += 1
+            if timings.cache:
+                self.counters['portfolio_response_cache_total', view, action, timings.cache.lower()] += 1
+
+    def render(self):
+        with self.lock:
+            histograms = {key: (list(h.cumulative()), h.sum) for key, h in self.histograms.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        for name, (help_text, _) in HISTOGRAMS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (series, view, action), (buckets, total) in sorted(histograms.items()):
+                if series != name:
+                    continue
+                labels = _labels(view=view, action=action)
+                for bound, count in buckets:
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {total}')
+                lines.append(f'{name}_count{{{labels}}} {buckets[-1][1]}')
+        for name, help_text in COUNTERS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            last = 'status' if name == 'portfolio_requests_total' else 'result'
+            for (series, view, action, value), count in sorted(counters.items()):
+                if series == name:
+                    lines.append(f'{name}{{{_labels(view=view, action=action, **{last: value})}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
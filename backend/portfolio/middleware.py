@@ -0,0 +1,371 @@
+import logging
+import random
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection, connections
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import acompress_stream, compress, compress_stream, is_compressible, negotiate_encoding
+from .instrumentation import QueryTimer, RequestTimings, count_rows, start_measuring, time_render
+from .metrics import metrics
+from .profiling import RequestProfiler, is_staff_request, profile_flagged, profile_requested
+from .query_budget import QueryBudgetExceeded, get_query_budget
+from .routers import READ_ONLY_ALIAS, reset_read_only, set_read_only
+
+logger = logging.getLogger('portfolio.requests')
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    Enforce the per-action ``query_budget`` declared on viewsets.
+
+    Only active when DEBUG is on. Set QUERY_BUDGET_RAISE = False to log
+    a warning header instead of failing the request.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.raise_on_exceeded = getattr(settings, 'QUERY_BUDGET_RAISE', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        return self.check(request, response, counter)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = await self.get_response(request)
+        return self.check(request, response, counter)
+
+    def check(self, request, response, counter):
+        budget = getattr(request, '_query_budget', None)
+        if budget is not None and counter.count > budget:
+            message = (
+                f"{request.method} {request.path} ran {counter.count} queries, "
+                f"budget is {budget}"
+            )
+            if self.raise_on_exceeded:
+                raise QueryBudgetExceeded(message)
+            response['X-Query-Budget-Exceeded'] = message
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_cls = getattr(view_func, 'cls', None)
+        actions = getattr(view_func, 'actions', None)
+        if view_cls is None or not actions:
+            return None
+        action = actions.get(request.method.lower())
+        request._query_budget = get_query_budget(view_cls, action)
+        return None
+
+
+class ReadOnlyRoutingMiddleware:
+    """
+    Let ReadOnlyRouter send the reads of GET/HEAD API requests to the
+    ``readonly`` database. Not used unless that alias is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if READ_ONLY_ALIAS not in connections.settings:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def is_read_only(self, request):
+        return request.method in ('GET', 'HEAD') and request.path.startswith('/api/')
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = set_read_only(self.is_read_only(request))
+        try:
+            return self.get_response(request)
+        finally:
+            reset_read_only(token)
+
+    async def __acall__(self, request):
+        token = set_read_only(self.is_read_only(request))
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_read_only(token)
+
+
+class RequestLogMiddleware:
+    """
+    Log a structured record for a sample of API requests.
+
+    PORTFOLIO_REQUEST_LOG_SAMPLE_RATE sets the fraction of requests that are
+    measured; unsampled requests skip all instrumentation. Records go to the
+    ``portfolio.requests`` logger, which settings route through a queue.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, 'PORTFOLIO_REQUEST_LOG_SAMPLE_RATE', 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def sampled(self, request):
+        if not request.path.startswith('/api/') or random.random() >= self.sample_rate:
+            return False
+        request._log_sampled = True
+        return True
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.sampled(request):
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start_measuring(request, timer)
+        start = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        self.log(request, response, timer, perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled(request):
+            return await self.get_response(request)
+
+        # Async views run their queries on the request's sync thread, which
+        # shares this connection object, so the wrapper still sees them
+        timer = QueryTimer()
+        start_measuring(request, timer)
+        start = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = await self.get_response(request)
+        self.log(request, response, timer, perf_counter() - start)
+        return response
+
+    def log(self, request, response, timer, total):
+        match = request.resolver_match
+        logger.info('api request', extra={
+            'endpoint': match.view_name if match else request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'rows': count_rows(response),
+            'queries': timer.count,
+            'db_ms': round(timer.duration * 1000, 3),
+            'serialize_ms': round(request._serialize_duration * 1000, 3),
+            'total_ms': round(total * 1000, 3),
+            'bytes': len(response.content) if not response.streaming else None,
+        })
+
+    def process_template_response(self, request, response):
+        if getattr(request, '_log_sampled', False):
+            time_render(request, response)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Measure every API request: query count and time, serialization time,
+    response cache result and body size.
+
+    The numbers go back to the client in a Server-Timing header (unless
+    PORTFOLIO_SERVER_TIMING is False) and into the per view and action
+    histograms served at /api/metrics/. PORTFOLIO_METRICS = False removes
+    the middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PORTFOLIO_METRICS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'PORTFOLIO_SERVER_TIMING', True)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start_measuring(request, timer)
+        start = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        return self.record(request, response, timer, perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not request.path.startswith('/api/'):
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        start_measuring(request, timer)
+        start = perf_counter()
+        with connection.execute_wrapper(timer):
+            response = await self.get_response(request)
+        return self.record(request, response, timer, perf_counter() - start)
+
+    def labels(self, request):
+        method = request.method.lower()
+        match = request.resolver_match
+        if match is None:
+            return 'unmatched', method
+        actions = getattr(match.func, 'actions', None) or {}
+        return match.view_name, actions.get(method, method)
+
+    def record(self, request, response, timer, total):
+        timings = RequestTimings(
+            total,
+            timer,
+            serialize=request._serialize_duration,
+            cache=response.get('X-Cache'),
+            size=None if response.streaming else len(response.content),
+        )
+        metrics.observe(*self.labels(request), response.status_code, timings)
+        if self.server_timing:
+            response['Server-Timing'] = timings.server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        if request.path.startswith('/api/'):
+            time_render(request, response)
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Profile single requests on demand. Staff send ``?profile=1`` or an
+    ``X-Profile: 1`` header; the response's X-Profile-Report header names
+    the report, browsable under /admin/profiles/.
+
+    Unflagged requests pass straight through, and PORTFOLIO_PROFILER = False
+    removes the middleware altogether. Under ASGI, cProfile only sees the
+    event loop thread, not sync code handed off to worker threads.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PORTFOLIO_PROFILER', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not profile_requested(request):
+            return self.get_response(request)
+        with RequestProfiler(request) as profiler:
+            response = self.get_response(request)
+        return profiler.finish(response)
+
+    async def __acall__(self, request):
+        if not profile_flagged(request) or not await sync_to_async(is_staff_request)(request):
+            return await self.get_response(request)
+        with RequestProfiler(request) as profiler:
+            response = await self.get_response(request)
+        return await sync_to_async(profiler.finish)(response)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress text responses with brotli or gzip, whichever the client
+    prefers in Accept-Encoding (brotli only when the package is installed).
+
+    Responses smaller than PORTFOLIO_COMPRESSION_MIN_SIZE bytes are sent as
+    is, and streaming responses are compressed chunk by chunk.
+
+    Only the token-authenticated API under PORTFOLIO_API_PREFIXES is
+    compressed, and never a response that sets a cookie or embeds a CSRF
+    token: compressing secrets next to reflected input exposes them to
+    BREACH, and gzip's random padding is no defence for brotli.
+    """
+
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'PORTFOLIO_COMPRESSION_MIN_SIZE', 512)
+        self.quality = getattr(settings, 'PORTFOLIO_COMPRESSION_BROTLI_QUALITY', 4)
+        self.prefixes = tuple(getattr(settings, 'PORTFOLIO_API_PREFIXES', ('/api/',)))
+
+    def process_response(self, request, response):
+        if not request.path_info.startswith(self.prefixes):
+            return response
+        if response.cookies or request.META.get('CSRF_COOKIE_USED'):
+            return response
+        if response.status_code == 304:
+            # Send the same validator the compressed 200 carried
+            if negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')) is not None:
+                self.weaken_etag(response)
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        if response.has_header('Content-Encoding') or not is_compressible(response.get('Content-Type', '')):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        options = {'quality': self.quality, 'max_random_bytes': self.max_random_bytes}
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding, **options)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding, **options)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding, **options)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        self.weaken_etag(response)
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def weaken_etag(self, response):
+        # The encoded bytes differ, so a strong ETag must become weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
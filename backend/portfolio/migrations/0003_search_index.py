@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# Mirrors portfolio.search.SEARCH_TYPES at the time of this migration
+SEARCH_TYPES = [
+    ('service', 1, ('title',), ('description',), None),
+    ('employee', 2, ('name',), ('designation', 'bio', 'department'), 'is_active'),
+    ('project', 3, ('title',), ('description', 'category', 'client'), None),
+    ('testimonial', 4, ('name',), ('company', 'position', 'content'), 'is_active'),
+]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS portfolio_search USING fts5('
+        'type UNINDEXED, is_public UNINDEXED, title, body, '
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+    for name, code, title_fields, body_fields, public_field in SEARCH_TYPES:
+        model = apps.get_model('portfolio', name)
+        for instance in model.objects.iterator():
+            schema_editor.execute(
+                'INSERT INTO portfolio_search (rowid, type, is_public, title, body) VALUES (%s, %s, %s, %s, %s)',
+                (
+                    instance.pk * 8 + code,
+                    name,
+                    True if public_field is None else getattr(instance, public_field),
+                    ' '.join(str(getattr(instance, field) or '') for field in title_fields),
+                    ' '.join(str(getattr(instance, field) or '') for field in body_fields),
+                ),
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS portfolio_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0002_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
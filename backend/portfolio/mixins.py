@@ -0,0 +1,149 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .cache import cache_response
+from .conditional import conditional_get
+from .fast import chunked, fast_serialization_enabled, get_plan, get_stream_chunk_size
+from .instrumentation import timed_serialization
+from .renderers import StreamingJSONRenderer
+
+
+class CachedResponseMixin:
+    """
+    Cache ``list`` and ``retrieve`` for public, read-mostly viewsets and
+    answer conditional requests for them.
+    """
+
+    cache_models = ()
+    cache_query_params = ('page', 'page_size', 'fields', 'expand')
+
+    @conditional_get
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """
+    Support ``?fields=a,b`` and ``?expand=relation`` on read actions.
+
+    Sparse requests are served by ``sparse_serializer_class`` (the slim list
+    serializer where one exists) and the queryset is narrowed with
+    ``.only()`` so unused columns and relations are never fetched. Requests
+    without either parameter keep the full serializer.
+    """
+
+    sparse_serializer_class = None
+
+    def get_param_list(self, name):
+        value = self.request.query_params.get(name, '')
+        return tuple(part.strip() for part in value.split(',') if part.strip())
+
+    def is_sparse(self):
+        params = self.request.query_params
+        return self.action in ('list', 'retrieve') and ('fields' in params or 'expand' in params)
+
+    def get_serializer_class(self):
+        if self.is_sparse():
+            return self.sparse_serializer_class or self.serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_sparse():
+            kwargs.setdefault('fields', self.get_param_list('fields'))
+            kwargs.setdefault('expand', self.get_param_list('expand'))
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.is_sparse():
+            queryset = self.narrow_queryset(queryset)
+        return queryset
+
+    def narrow_queryset(self, queryset):
+        model = queryset.model
+        serializer = self.get_serializer()
+        expand = self.get_param_list('expand')
+        columns = {model._meta.pk.name}
+        # Keep ordering columns loaded so cursors don't trigger deferred loads
+        columns.update(name.lstrip('-') for name in model._meta.ordering)
+        prefetches = []
+        for field in serializer.fields.values():
+            source = field.source.split('.')[0]
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.many_to_many:
+                if source in expand:
+                    prefetches.append(source)
+                else:
+                    related = model_field.related_model
+                    prefetches.append(Prefetch(source, queryset=related.objects.only('pk')))
+            elif model_field.concrete:
+                columns.add(model_field.attname)
+        return queryset.prefetch_related(None).prefetch_related(*prefetches).only(*columns)
+
+
+class FastSerializationMixin:
+    """
+    Serve unpaginated ``list`` requests through a precompiled
+    SerializationPlan instead of the DRF serializer, falling back to the
+    serializer when the plan does not support one of its fields.
+
+    ``?stream=1`` streams the list as it is read, PORTFOLIO_STREAM_CHUNK_SIZE
+    rows at a time, for exports too large to build in memory.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if self.should_stream():
+            return self.stream_list(request)
+        plan = self.get_serialization_plan() if fast_serialization_enabled() else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        with timed_serialization(request):
+            return Response(plan.run(queryset, request))
+
+    def get_serialization_plan(self):
+        get_delegate = getattr(self.paginator, 'get_delegate', None)
+        if self.paginator is not None and (get_delegate is None or get_delegate(self.request)):
+            return None
+        fields = expand = ()
+        if getattr(self, 'is_sparse', lambda: False)():
+            fields, expand = self.get_param_list('fields'), self.get_param_list('expand')
+        return get_plan(self.get_serializer_class(), fields, expand)
+
+    def should_stream(self):
+        if self.request.query_params.get('stream') not in ('1', 'true'):
+            return False
+        get_delegate = getattr(self.paginator, 'get_delegate', None)
+        if self.paginator is not None and (get_delegate is None or get_delegate(self.request)):
+            return False
+        return isinstance(self.request.accepted_renderer, JSONRenderer)
+
+    def stream_list(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        chunk_size = get_stream_chunk_size()
+        plan = self.get_serialization_plan() if fast_serialization_enabled() else None
+        if plan is not None:
+            batches = plan.stream(queryset, request, chunk_size)
+        else:
+            batches = (
+                self.get_serializer(chunk, many=True).data
+                for chunk in chunked(queryset.iterator(chunk_size=chunk_size), chunk_size)
+            )
+        renderer = StreamingJSONRenderer()
+        return StreamingHttpResponse(
+            renderer.render_stream(batches, {'request': request, 'view': self}),
+            content_type=renderer.media_type,
+        )
@@ -28,6 +28,7 @@ class Employee(models.Model):
     department = models.CharField(max_length=20, choices=DEPARTMENT_CHOICES)
     bio = models.TextField()
     image = models.ImageField(upload_to='employees/')
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)  # See images.py
     email = models.EmailField(validators=[EmailValidator()])
     phone = models.CharField(max_length=20, blank=True)
     linkedin_url = models.URLField(validators=[URLValidator()], blank=True)
@@ -42,6 +43,19 @@ class Employee(models.Model):
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # EmployeeViewSet: is_active=True, optional department, ordered by name
+            models.Index(
+                fields=['department', 'name'],
+                condition=models.Q(is_active=True),
+                name='employee_active_dept_idx',
+            ),
+            models.Index(
+                fields=['name'],
+                condition=models.Q(is_active=True),
+                name='employee_active_name_idx',
+            ),
+        ]
 
 class Project(models.Model):
     STATUS_CHOICES = [
@@ -54,6 +68,7 @@ class Project(models.Model):
     description = models.TextField()
     category = models.CharField(max_length=100)
     image = models.ImageField(upload_to='projects/')
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)  # See images.py
     client = models.CharField(max_length=200)
     start_date = models.DateField()
     end_date = models.DateField(null=True, blank=True)
@@ -70,6 +85,11 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='project_status_created_idx'),
+            models.Index(fields=['category', '-created_at'], name='project_category_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='project_created_id_idx'),
+        ]
 
 class ContactInformation(models.Model):
     address = models.TextField()
@@ -113,12 +133,22 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at'], name='message_status_created_idx'),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_read=False),
+                name='message_unread_created_idx',
+            ),
+            models.Index(fields=['-created_at', '-id'], name='message_created_id_idx'),
+        ]
 
 class Testimonial(models.Model):
     name = models.CharField(max_length=100)
     position = models.CharField(max_length=100)
     company = models.CharField(max_length=100)
     image = models.ImageField(upload_to='testimonials/', blank=True)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)  # See images.py
     content = models.TextField()
     rating = models.PositiveIntegerField(default=5)
     is_active = models.BooleanField(default=True)
@@ -130,3 +160,16 @@ class Testimonial(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # TestimonialViewSet: is_active=True, optional rating, newest first
+            models.Index(
+                fields=['rating', '-created_at'],
+                condition=models.Q(is_active=True),
+                name='testimonial_active_rating_idx',
+            ),
+            models.Index(
+                fields=['-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='testimonial_active_created_idx',
+            ),
+        ]
@@ -0,0 +1,77 @@
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class PortfolioPageNumberPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class CreatedAtCursorPagination(CursorPagination):
+    """Keyset pagination on (-created_at, -id): no COUNT(*) and no OFFSET scan."""
+
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class OptInPagination(BasePagination):
+    """
+    Paginate only when the client asks for it.
+
+    ``?page=`` selects page-number pagination and, on viewsets that support
+    it, ``?cursor=`` or ``?pagination=cursor`` selects keyset pagination.
+    Requests without either keep the plain list the frontends expect.
+    """
+
+    page_number_class = PortfolioPageNumberPagination
+    cursor_class = None
+    # Serve cursor pages even when the client asks for neither
+    cursor_by_default = False
+    delegate = None
+
+    def get_delegate(self, request):
+        params = request.query_params
+        if self.cursor_class and ('cursor' in params or params.get('pagination') == 'cursor'):
+            return self.cursor_class()
+        if 'page' in params or 'page_size' in params:
+            return self.page_number_class()
+        # ?stream=1 exports are never paginated
+        if self.cursor_by_default and params.get('stream') not in ('1', 'true'):
+            return self.cursor_class()
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.delegate = self.get_delegate(request)
+        if self.delegate is None:
+            return None
+        return self.delegate.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegate.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = self.page_number_class().get_schema_operation_parameters(view)
+        if self.cursor_class:
+            parameters += self.cursor_class().get_schema_operation_parameters(view)
+        return parameters
+
+
+class CursorOptInPagination(OptInPagination):
+    cursor_class = CreatedAtCursorPagination
+
+
+class MessageCursorPagination(CreatedAtCursorPagination):
+    page_size = 50
+
+
+class MessagePagination(CursorOptInPagination):
+    """
+    The staff message list only grows, so it is never served whole: without
+    ``?page=`` it returns cursor pages of the newest 50 messages.
+    """
+
+    cursor_class = MessageCursorPagination
+    cursor_by_default = True
@@ -0,0 +1,188 @@
+import cProfile
+import io
+import json
+import pstats
+import re
+import uuid
+from contextlib import ExitStack
+from pathlib import Path
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication
+
+REPORT_ID = re.compile(r'^[\w-]+$')
+
+
+def get_profile_dir():
+    return Path(getattr(settings, 'PORTFOLIO_PROFILE_DIR', settings.BASE_DIR / 'profiles'))
+
+
+def profile_flagged(request):
+    """Whether the request carries ``?profile=1`` or an ``X-Profile: 1`` header."""
+    # Plain string checks first, so unflagged requests never parse anything
+    flag = request.META.get('HTTP_X_PROFILE')
+    if flag is None and 'profile=' not in request.META.get('QUERY_STRING', ''):
+        return False
+    return (flag or request.GET.get('profile')) in ('1', 'true')
+
+
+def is_staff_request(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        return True
+    # The lean /api/ chain has no session user; API clients send a JWT
+    try:
+        result = ClaimsJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return result is not None and result[0].is_staff
+
+
+def profile_requested(request):
+    """True when a staff user flagged this request for profiling."""
+    return profile_flagged(request) and is_staff_request(request)
+
+
+class RequestProfiler:
+    """
+    Run one request under cProfile while timing every query, then write a
+    report with the hottest functions and ``EXPLAIN QUERY PLAN`` for the
+    queries slower than PORTFOLIO_PROFILE_SLOW_QUERY_MS.
+    """
+
+    max_queries = 500
+
+    def __init__(self, request):
+        self.request = request
+        self.slow_query_ms = getattr(settings, 'PORTFOLIO_PROFILE_SLOW_QUERY_MS', 5)
+        self.queries = []
+        self.profile = cProfile.Profile()
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, many, perf_counter() - start))
+
+    def __enter__(self):
+        self.stack.enter_context(connection.execute_wrapper(self))
+        self.start = perf_counter()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.disable()
+        self.duration = perf_counter() - self.start
+        self.stack.close()
+
+    def finish(self, response):
+        """Save the report and point the response at it."""
+        report_id = save_report(self.build_report(response), self.profile)
+        response['X-Profile-Report'] = report_id
+        return response
+
+    def build_report(self, response):
+        request = self.request
+        user = getattr(request, 'user', None)
+        queries = []
+        for sql, params, many, duration in self.queries[:self.max_queries]:
+            ms = duration * 1000
+            query = {'sql': sql, 'params': params, 'many': many, 'duration_ms': round(ms, 3)}
+            if ms >= self.slow_query_ms:
+                query['slow'] = True
+                query['plan'] = None if many else explain(sql, params)
+            queries.append(query)
+
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).strip_dirs().sort_stats('cumulative').print_stats(
+            getattr(settings, 'PORTFOLIO_PROFILE_FUNCTIONS', 40)
+        )
+        return {
+            'created': timezone.now().isoformat(),
+            'method': request.method,
+            'path': request.path,
+            'query_string': request.META.get('QUERY_STRING', ''),
+            'user': str(getattr(user, 'pk', None) or ''),
+            'status': response.status_code,
+            'cache': response.get('X-Cache'),
+            'duration_ms': round(self.duration * 1000, 3),
+            'query_count': len(self.queries),
+            'db_ms': round(sum(query[3] for query in self.queries) * 1000, 3),
+            'slow_query_ms': self.slow_query_ms,
+            'queries': queries,
+            'profile': stream.getvalue(),
+        }
+
+
+def explain(sql, params):
+    """The database's plan for a read query; ``None`` for anything else."""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    prefix = 'EXPLAIN QUERY PLAN' if connection.vendor == 'sqlite' else 'EXPLAIN'
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            rows = cursor.fetchall()
+    except Exception as exc:
+        return [f'EXPLAIN failed: {exc}']
+    if connection.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+def save_report(report, profile):
+    """Write ``<id>.json`` and the raw ``<id>.prof`` stats; return the id."""
+    directory = get_profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    report_id = f'{timezone.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}'
+    report['id'] = report_id
+    (directory / f'{report_id}.json').write_text(json.dumps(report, indent=2, default=str))
+    profile.dump_stats(directory / f'{report_id}.prof')
+    prune_reports(getattr(settings, 'PORTFOLIO_PROFILE_KEEP', 200))
+    return report_id
+
+
+def report_paths():
+    """Report files, newest first."""
+    directory = get_profile_dir()
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob('*.json'), reverse=True)
+
+
+def list_reports():
+    reports = []
+    for path in report_paths():
+        try:
+            reports.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return reports
+
+
+def load_report(report_id):
+    if not REPORT_ID.match(report_id):
+        return None
+    try:
+        return json.loads((get_profile_dir() / f'{report_id}.json').read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def stats_path(report_id):
+    path = get_profile_dir() / f'{report_id}.prof'
+    return path if REPORT_ID.match(report_id) and path.is_file() else None
+
+
+def prune_reports(keep):
+    for path in report_paths()[keep:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
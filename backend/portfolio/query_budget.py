@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_query_budget(view_cls, action):
+    # Viewsets declare budgets as ``query_budget = {'list': 2, ...}``
+    budgets = getattr(view_cls, 'query_budget', None) or {}
+    return budgets.get(action)
+
+
+@contextmanager
+def assert_max_queries(limit, label='block'):
+    """Fail if the wrapped block runs more than ``limit`` queries."""
+    with CaptureQueriesContext(connection) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed > limit:
+        statements = '\n'.join(q['sql'] for q in context.captured_queries)
+        raise QueryBudgetExceeded(
+            f"{label} ran {executed} queries, budget is {limit}:\n{statements}"
+        )
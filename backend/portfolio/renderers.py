@@ -0,0 +1,59 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    The output is byte-identical to JSONRenderer's compact output for the
+    strings, ints, bools, lists and dicts the portfolio API returns (floats
+    in exponent notation are the one known difference). Indented output, and
+    anything orjson cannot encode, goes through the stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoder.default,
+                # DRF formats these itself; orjson's native output differs
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    Encode a list that arrives in batches as one JSON array, yielding bytes
+    as each batch is encoded. The concatenated output is identical to
+    rendering the whole list at once.
+    """
+
+    def render_stream(self, batches, renderer_context=None):
+        yield b'['
+        first = True
+        for batch in batches:
+            if not batch:
+                continue
+            body = self.render(batch, self.media_type, renderer_context)[1:-1]
+            yield body if first else b',' + body
+            first = False
+        yield b']'
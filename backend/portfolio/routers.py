@@ -0,0 +1,40 @@
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+READ_ONLY_ALIAS = 'readonly'
+
+_read_only = ContextVar('portfolio_read_only', default=False)
+
+
+def set_read_only(value):
+    """Mark the current request as read-only; returns a token for ``reset_read_only``."""
+    return _read_only.set(value)
+
+
+def reset_read_only(token):
+    _read_only.reset(token)
+
+
+class ReadOnlyRouter:
+    """
+    Route reads made while serving a safe API request to the ``readonly``
+    database, a read-only connection to the same SQLite file.
+
+    Everything else, including reads inside a transaction on the default
+    database (which must see its own uncommitted writes), stays on default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_only.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return READ_ONLY_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
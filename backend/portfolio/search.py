@@ -0,0 +1,136 @@
+import re
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Service, Employee, Project, Testimonial
+
+# FTS5 table created by migration 0003_search_index
+TABLE = 'portfolio_search'
+
+# type name -> (code, model, title fields, body fields, public filter).
+# Rows are keyed by rowid = pk * 8 + code so saves and deletes touch one
+# row by primary key instead of scanning the index.
+SEARCH_TYPES = {
+    'service': (1, Service, ('title',), ('description',), None),
+    'employee': (2, Employee, ('name',), ('designation', 'bio', 'department'), 'is_active'),
+    'project': (3, Project, ('title',), ('description', 'category', 'client'), None),
+    'testimonial': (4, Testimonial, ('name',), ('company', 'position', 'content'), 'is_active'),
+}
+TYPE_SLOTS = 8
+
+_terms = re.compile(r'\w+', re.UNICODE)
+
+
+def get_search_type(model):
+    for name, config in SEARCH_TYPES.items():
+        if config[1] is model:
+            return name, config
+    return None, None
+
+
+def document(instance, config):
+    code, model, title_fields, body_fields, public_field = config
+    return (
+        instance.pk * TYPE_SLOTS + code,
+        model._meta.model_name,
+        True if public_field is None else bool(getattr(instance, public_field)),
+        ' '.join(str(getattr(instance, field) or '') for field in title_fields),
+        ' '.join(str(getattr(instance, field) or '') for field in body_fields),
+    )
+
+
+def index_instance(instance):
+    name, config = get_search_type(type(instance))
+    if name is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [instance.pk * TYPE_SLOTS + config[0]])
+        cursor.execute(
+            f'INSERT INTO {TABLE} (rowid, type, is_public, title, body) VALUES (%s, %s, %s, %s, %s)',
+            document(instance, config),
+        )
+
+
+def remove_instance(instance):
+    name, config = get_search_type(type(instance))
+    if name is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE} WHERE rowid = %s', [instance.pk * TYPE_SLOTS + config[0]])
+
+
+def rebuild_index(batch_size=1000):
+    """Re-index every searchable row; for bulk loads that bypass the signals."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLE}')
+        for config in SEARCH_TYPES.values():
+            _, model, title_fields, body_fields, public_field = config
+            fields = ['pk', *title_fields, *body_fields] + ([public_field] if public_field else [])
+            rows = model.objects.order_by().only(*fields).iterator(chunk_size=batch_size)
+            cursor.executemany(
+                f'INSERT INTO {TABLE} (rowid, type, is_public, title, body) VALUES (%s, %s, %s, %s, %s)',
+                (document(instance, config) for instance in rows),
+            )
+
+
+def build_match(query):
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix,
+    so "djan rest" finds "Django REST framework". Returns '' for no words.
+    """
+    return ' '.join(f'"{term}"*' for term in _terms.findall(query.lower()))
+
+
+def search(query, types=None, limit=20, public_only=True):
+    """
+    Return ``[{'type', 'id', 'title', 'snippet', 'score'}]`` best first.
+
+    Scores are BM25 with title matches weighted above body matches;
+    lower is better, as FTS5 reports them.
+    """
+    match = build_match(query)
+    if not match:
+        return []
+    sql = (
+        f"SELECT rowid, type, title, snippet({TABLE}, 3, '', '', '…', 12), "
+        f'bm25({TABLE}, 0, 0, 10.0, 1.0) AS score FROM {TABLE} WHERE {TABLE} MATCH %s'
+    )
+    params = [match]
+    if public_only:
+        sql += ' AND is_public = 1'
+    if types:
+        sql += f" AND rowid %% {TYPE_SLOTS} IN ({', '.join(['%s'] * len(types))})"
+        params += [SEARCH_TYPES[name][0] for name in types]
+    sql += ' ORDER BY score LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {'type': kind, 'id': rowid // TYPE_SLOTS, 'title': title, 'snippet': snippet, 'score': round(score, 4)}
+            for rowid, kind, title, snippet, score in cursor.fetchall()
+        ]
+
+
+def indexed_fields(model):
+    """The model fields the index covers; empty for unindexed models."""
+    name, config = get_search_type(model)
+    return set(config[2] + config[3]) if name else set()
+
+
+def search_pks(model, query):
+    """
+    A subquery of the primary keys of every ``model`` row matching
+    ``query``, public or not, for ``pk__in=``; ``None`` when nothing can
+    match. Kept in SQL so broad matches never bind one parameter per hit.
+    """
+    name, config = get_search_type(model)
+    match = build_match(query)
+    if name is None or not match:
+        return None
+    # Filter on the rowid's type slot: reading the type column would load
+    # every matching row's content
+    return RawSQL(
+        f'SELECT rowid / {TYPE_SLOTS} FROM {TABLE} WHERE {TABLE} MATCH %s AND rowid %% {TYPE_SLOTS} = %s',
+        [match, config[0]],
+    )
@@ -1,35 +1,159 @@
 from rest_framework import serializers
+from .images import build_srcset
+from .instrumentation import timed_serialization
 from .models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ImageSrcsetField(serializers.Field):
+    """Expose the generated derivatives of an image as srcset strings per format."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'image_derivatives')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return build_srcset(value, self.context.get('request'))
+
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed_serialization(self.context.get('request')):
+            return super().data
+
+class TimedSerializerMixin:
+    """
+    Count ``.data`` towards the request's serialization time. Output
+    serializers also set ``Meta.list_serializer_class = TimedListSerializer``
+    so lists are timed once, not per item.
+    """
+
+    @property
+    def data(self):
+        with timed_serialization(self.context.get('request')):
+            return super().data
+
+class SparseFieldsetSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    ModelSerializer that accepts ``fields`` and ``expand`` keyword arguments.
+
+    ``fields`` limits the output to the named fields (``default_fields`` when
+    not given). Relations listed in ``expandable_fields`` are rendered as
+    primary keys unless named in ``expand``.
+    """
+
+    default_fields = None
+    expandable_fields = {}
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in expand:
+            if name in self.expandable_fields:
+                self.fields[name] = self.expandable_fields[name]()
+        keep = fields or self.default_fields
+        if keep:
+            for name in set(self.fields) - set(keep) - set(expand):
+                self.fields.pop(name)
+
+class ServiceSerializer(SparseFieldsetSerializer):
     class Meta:
         model = Service
         fields = '__all__'
+        list_serializer_class = TimedListSerializer
+
+class EmployeeSerializer(SparseFieldsetSerializer):
+    image_srcset = ImageSrcsetField()
 
-class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
-        fields = '__all__'
+        exclude = ['image_derivatives']
+        list_serializer_class = TimedListSerializer
+
+class EmployeeListSerializer(EmployeeSerializer):
+    default_fields = (
+        'id', 'name', 'designation', 'department', 'image', 'image_srcset',
+        'linkedin_url', 'twitter_url', 'github_url',
+    )
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     team_members = EmployeeSerializer(many=True, read_only=True)
+    image_srcset = ImageSrcsetField()
 
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['image_derivatives']
+        list_serializer_class = TimedListSerializer
+
+class ProjectListSerializer(SparseFieldsetSerializer):
+    image_srcset = ImageSrcsetField()
+    default_fields = (
+        'id', 'title', 'category', 'image', 'image_srcset', 'client', 'status',
+        'technologies', 'team_members',
+    )
+    expandable_fields = {
+        'team_members': lambda: EmployeeListSerializer(many=True, read_only=True),
+    }
 
-class ContactInformationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        exclude = ['image_derivatives']
+        list_serializer_class = TimedListSerializer
+
+class ContactInformationSerializer(SparseFieldsetSerializer):
     class Meta:
         model = ContactInformation
         fields = '__all__'
+        list_serializer_class = TimedListSerializer
 
-class ContactMessageSerializer(serializers.ModelSerializer):
+class ContactMessageSerializer(SparseFieldsetSerializer):
     class Meta:
         model = ContactMessage
         fields = '__all__'
+        list_serializer_class = TimedListSerializer
         read_only_fields = ['status', 'is_read']
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class ContactMessageFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=ContactMessage.STATUS_CHOICES, required=False)
+    is_read = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        # An empty filter would match every message
+        if not attrs:
+            raise serializers.ValidationError('Filter by status and/or is_read')
+        return attrs
+
+class ContactMessageBulkUpdateSerializer(serializers.Serializer):
+    """Select messages by ``ids`` or by ``filter`` and set ``status`` and/or ``is_read``."""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    filter = ContactMessageFilterSerializer(required=False)
+    status = serializers.ChoiceField(choices=ContactMessage.STATUS_CHOICES, required=False)
+    is_read = serializers.BooleanField(required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError('Provide either ids or filter')
+        if 'status' not in attrs and 'is_read' not in attrs:
+            raise serializers.ValidationError('Nothing to update: set status and/or is_read')
+        return attrs
+
+class TeamMembershipSerializer(serializers.Serializer):
+    """Either ``add`` and/or ``remove`` lists of employee ids, or a ``replace`` list."""
+    add = serializers.ListField(child=serializers.IntegerField(), required=False)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False)
+    replace = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        if 'replace' in attrs and ('add' in attrs or 'remove' in attrs):
+            raise serializers.ValidationError('Use replace on its own, or add/remove')
+        if not attrs:
+            raise serializers.ValidationError('Provide add, remove or replace')
+        if set(attrs.get('add', ())) & set(attrs.get('remove', ())):
+            raise serializers.ValidationError('An employee cannot be both added and removed')
+        return attrs
+
+class TestimonialSerializer(SparseFieldsetSerializer):
+    image_srcset = ImageSrcsetField()
+
     class Meta:
         model = Testimonial
-        fields = '__all__'
+        exclude = ['image_derivatives']
+        list_serializer_class = TimedListSerializer
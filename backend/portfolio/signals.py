@@ -0,0 +1,77 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.dispatch import receiver
+
+from .authentication import forget_auth_version
+from .cache import invalidate_on_commit
+from .images import needs_derivatives, schedule_derivatives
+from .search import SEARCH_TYPES, index_instance, remove_instance
+from .static_export import schedule_export
+from .models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
+
+CACHED_MODELS = (Service, Employee, Project, ContactInformation, ContactMessage, Testimonial)
+
+
+def invalidate_model(sender, using=None, **kwargs):
+    invalidate_on_commit(sender, using)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_model, sender=model, dispatch_uid=f'invalidate-save-{model.__name__}')
+    post_delete.connect(invalidate_model, sender=model, dispatch_uid=f'invalidate-delete-{model.__name__}')
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def invalidate_team_members(sender, action, using=None, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_on_commit(Project, using)
+
+
+@receiver(pre_save, sender=Employee)
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Testimonial)
+def forget_stale_derivatives(sender, instance, **kwargs):
+    # A replaced image must not be served with the old one's srcset
+    if instance.image_derivatives and instance.image_derivatives['source'] != instance.image.name:
+        instance.image_derivatives = {}
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Testimonial)
+def create_image_derivatives(sender, instance, **kwargs):
+    # Saves that leave a fully derived image alone generate nothing
+    if needs_derivatives(instance):
+        schedule_derivatives(instance.image.name)
+
+
+def update_search_index(sender, instance, **kwargs):
+    index_instance(instance)
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for _, model, *_ in SEARCH_TYPES.values():
+    post_save.connect(update_search_index, sender=model, dispatch_uid=f'search-save-{model.__name__}')
+    post_delete.connect(remove_from_search_index, sender=model, dispatch_uid=f'search-delete-{model.__name__}')
+
+
+def export_on_change(sender, action='post_save', **kwargs):
+    if action.startswith('post') and getattr(settings, 'PORTFOLIO_STATIC_EXPORT_ON_CHANGE', False):
+        schedule_export()
+
+
+for model in CACHED_MODELS:
+    if model is not ContactMessage:
+        post_save.connect(export_on_change, sender=model, dispatch_uid=f'export-save-{model.__name__}')
+        post_delete.connect(export_on_change, sender=model, dispatch_uid=f'export-delete-{model.__name__}')
+m2m_changed.connect(export_on_change, sender=Project.team_members.through, dispatch_uid='export-team-members')
+
+
+@receiver(post_save, sender=get_user_model())
+def revoke_stale_tokens(sender, instance, **kwargs):
+    # Drop the cached auth version so token checks see the change right away
+    forget_auth_version(instance)
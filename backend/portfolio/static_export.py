@@ -0,0 +1,160 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import resolve
+
+from .compression import brotli
+from .models import Service, Employee, Project, ContactInformation, Testimonial
+
+logger = logging.getLogger(__name__)
+
+CURRENT_LINK = 'current'
+RELEASES_DIR = 'releases'
+
+
+def get_export_root():
+    return Path(getattr(settings, 'PORTFOLIO_STATIC_EXPORT_ROOT', settings.BASE_DIR / 'static-export'))
+
+
+def public_urls():
+    """Every public list, filter variant and detail URL of the API."""
+    urls = ['/api/bundle/', '/api/services/', '/api/employees/', '/api/projects/',
+            '/api/testimonials/', '/api/contact-info/']
+    urls += [
+        f'/api/employees/?{urlencode({"department": value})}'
+        for value, _ in Employee.DEPARTMENT_CHOICES
+    ]
+    urls += [f'/api/projects/?{urlencode({"status": value})}' for value, _ in Project.STATUS_CHOICES]
+    urls += [
+        f'/api/projects/?{urlencode({"category": value})}'
+        for value in Project.objects.order_by().values_list('category', flat=True).distinct()
+    ]
+    urls += [
+        f'/api/testimonials/?{urlencode({"rating": value})}'
+        for value in Testimonial.objects.filter(is_active=True).order_by()
+        .values_list('rating', flat=True).distinct()
+    ]
+    for prefix, queryset in [
+        ('services', Service.objects.all()),
+        ('employees', Employee.objects.filter(is_active=True)),
+        ('projects', Project.objects.all()),
+        ('testimonials', Testimonial.objects.filter(is_active=True)),
+        ('contact-info', ContactInformation.objects.all()),
+    ]:
+        urls += [f'/api/{prefix}/{pk}/' for pk in queryset.order_by('pk').values_list('pk', flat=True)]
+    return urls
+
+
+def render(url, factory):
+    parts = urlsplit(url)
+    request = factory.get(url)
+    match = resolve(parts.path)
+    response = match.func(request, *match.args, **match.kwargs)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} returned {response.status_code}')
+    return response.content
+
+
+def file_stem(url):
+    parts = urlsplit(url)
+    stem = parts.path.strip('/') + '/index'
+    if parts.query:
+        stem += '.' + parts.query.replace('=', '-').replace('&', '.').replace('%', '_')
+    return stem
+
+
+def write_variants(directory, stem, content):
+    digest = sha256(content).hexdigest()[:16]
+    name = f'{stem}.{digest}.json'
+    path = directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    encodings = {}
+    path.with_name(path.name + '.gz').write_bytes(gzip.compress(content, 9, mtime=0))
+    encodings['gzip'] = name + '.gz'
+    if brotli is not None:
+        path.with_name(path.name + '.br').write_bytes(brotli.compress(content))
+        encodings['br'] = name + '.br'
+    return {'file': name, 'etag': digest, 'size': len(content), 'encodings': encodings}
+
+
+def export_static_json(root=None, base_url=None, keep=3):
+    """
+    Render every public endpoint into a new release directory and switch
+    the ``current`` symlink to it atomically.
+
+    The manifest maps each API URL (path plus query) to its content-hashed
+    file and pre-compressed variants, so a front proxy can serve the API
+    without touching Django. Readers see either the old or the new release,
+    never a half-written one.
+    """
+    root = Path(root or get_export_root())
+    base_url = base_url or getattr(settings, 'PORTFOLIO_STATIC_EXPORT_BASE_URL', 'http://localhost:8000')
+    scheme, host = urlsplit(base_url)[:2]
+    factory = RequestFactory(HTTP_HOST=host, **{'wsgi.url_scheme': scheme})
+
+    releases = root / RELEASES_DIR
+    releases.mkdir(parents=True, exist_ok=True)
+    release = Path(tempfile.mkdtemp(dir=releases, prefix='.building-'))
+    try:
+        manifest = {url: write_variants(release, file_stem(url), render(url, factory)) for url in public_urls()}
+        (release / 'manifest.json').write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        final = releases / sha256(json.dumps(manifest, sort_keys=True).encode()).hexdigest()[:16]
+        if final.exists():
+            shutil.rmtree(release)
+        else:
+            os.rename(release, final)
+    except BaseException:
+        shutil.rmtree(release, ignore_errors=True)
+        raise
+
+    link = root / CURRENT_LINK
+    tmp_link = root / f'.{CURRENT_LINK}-{os.getpid()}-{threading.get_ident()}'
+    os.symlink(os.path.relpath(final, root), tmp_link)
+    os.replace(tmp_link, link)
+    prune_releases(releases, final, keep)
+    return final, manifest
+
+
+def prune_releases(releases, current, keep):
+    finished = sorted(
+        (path for path in releases.iterdir() if not path.name.startswith('.') and path != current),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in finished[max(keep - 1, 0):]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='static-export')
+_pending = threading.Event()
+
+
+def _run_export():
+    _pending.clear()
+    try:
+        export_static_json()
+    except Exception:
+        logger.exception('Static JSON export failed')
+
+
+def schedule_export():
+    """Queue one export after the current transaction commits, coalescing bursts."""
+    def submit():
+        if not _pending.is_set():
+            _pending.set()
+            _executor.submit(_run_export)
+    transaction.on_commit(submit)
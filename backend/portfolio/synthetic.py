@@ -0,0 +1,198 @@
+import random
+from hashlib import md5
+from datetime import date, timedelta
+from io import BytesIO
+from itertools import islice
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+
+from .cache import bump_model_version
+from .search import rebuild_index
+from .models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
+
+FIRST_NAMES = ['Alex', 'Jane', 'John', 'Mike', 'Sarah', 'Emily', 'Michael', 'Olivia', 'Liam', 'Ava']
+LAST_NAMES = ['Smith', 'Doe', 'Johnson', 'Williams', 'Chen', 'Brown', 'Garcia', 'Khan', 'Lee', 'Silva']
+DESIGNATIONS = ['Engineer', 'Senior Developer', 'Designer', 'Project Manager', 'Analyst', 'Consultant']
+CATEGORIES = ['Web Development', 'Mobile Development', 'Web & Mobile', 'UI/UX Design', 'Cloud Solutions']
+TECHNOLOGIES = ['React', 'Node.js', 'Django', 'PostgreSQL', 'AWS', 'Docker', 'Angular', 'Firebase']
+COMPANIES = ['RetailCo Inc.', 'FinBank Corp', 'HealthCare Plus', 'Growth Co.', 'Innovate Labs']
+WORDS = (
+    'modern scalable secure platform application design delivery team client '
+    'cloud mobile experience product data strategy performance quality'
+).split()
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class SyntheticDataGenerator:
+    """
+    Generate deterministic fake portfolio data at load-test scale.
+
+    Rows are produced lazily and written with ``bulk_create`` in batches, so
+    memory stays flat regardless of the requested counts. ``progress`` is
+    called as ``progress(label, done, total)`` after every batch.
+    """
+
+    def __init__(self, seed=0, batch_size=2000, progress=None, placeholder_count=8):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda label, done, total: None)
+        self.placeholder_count = placeholder_count
+        self.today = date(2025, 1, 1)
+
+    def sentence(self, words=12):
+        return ' '.join(self.random.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+    def placeholder_images(self, folder, size):
+        """Write a handful of solid-colour JPEGs once and return their names."""
+        from PIL import Image
+
+        names = []
+        for i in range(self.placeholder_count):
+            name = f'{folder}/placeholder_{size[0]}x{size[1]}_{i}.jpg'
+            if not default_storage.exists(name):
+                # Derived from the name so existing files don't shift the RNG
+                digest = md5(name.encode(), usedforsecurity=False).digest()
+                colour = tuple(40 + byte % 176 for byte in digest[:3])
+                buffer = BytesIO()
+                Image.new('RGB', size, colour).save(buffer, 'JPEG', quality=70)
+                default_storage.save(name, ContentFile(buffer.getvalue()))
+            names.append(name)
+        return names
+
+    def bulk_insert(self, model, rows, total, label=None):
+        """Insert ``rows`` in batches and return the new primary keys."""
+        label = label or model._meta.verbose_name_plural
+        pks = []
+        for batch in batched(rows, self.batch_size):
+            created = model.objects.bulk_create(batch)
+            pks.extend(obj.pk for obj in created)
+            self.progress(label, len(pks), total)
+        return pks
+
+    def services(self, count):
+        rows = (
+            Service(title=f'Service {i}', description=self.sentence(), icon='faCode')
+            for i in range(count)
+        )
+        return self.bulk_insert(Service, rows, count)
+
+    def employees(self, count):
+        images = self.placeholder_images('employees', (400, 400))
+        departments = [value for value, _ in Employee.DEPARTMENT_CHOICES]
+        choice = self.random.choice
+        rows = (
+            Employee(
+                name=f'{choice(FIRST_NAMES)} {choice(LAST_NAMES)} {i}',
+                designation=choice(DESIGNATIONS),
+                department=choice(departments),
+                bio=self.sentence(20),
+                image=choice(images),
+                email=f'employee{i}@example.com',
+                is_active=self.random.random() < 0.9,
+            ) for i in range(count)
+        )
+        return self.bulk_insert(Employee, rows, count)
+
+    def projects(self, count, employee_pks=(), team_size=3):
+        images = self.placeholder_images('projects', (800, 450))
+        statuses = [value for value, _ in Project.STATUS_CHOICES]
+        choice = self.random.choice
+        rows = (
+            Project(
+                title=f'Project {i}',
+                description=self.sentence(30),
+                category=choice(CATEGORIES),
+                image=choice(images),
+                client=choice(COMPANIES),
+                start_date=self.today - timedelta(days=self.random.randrange(30, 1500)),
+                status=choice(statuses),
+                technologies=self.random.sample(TECHNOLOGIES, 3),
+            ) for i in range(count)
+        )
+        project_pks = self.bulk_insert(Project, rows, count)
+        if employee_pks and team_size:
+            self.team_members(project_pks, employee_pks, team_size)
+        return project_pks
+
+    def team_members(self, project_pks, employee_pks, team_size):
+        # Write the through table directly instead of one add() per project
+        Through = Project.team_members.through
+        team_size = min(team_size, len(employee_pks))
+        rows = (
+            Through(project_id=project_pk, employee_id=employee_pk)
+            for project_pk in project_pks
+            for employee_pk in self.random.sample(employee_pks, team_size)
+        )
+        total = len(project_pks) * team_size
+        self.bulk_insert(Through, rows, total, label='team memberships')
+
+    def testimonials(self, count):
+        rows = (
+            Testimonial(
+                name=f'{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}',
+                position=self.random.choice(DESIGNATIONS),
+                company=self.random.choice(COMPANIES),
+                content=self.sentence(25),
+                rating=self.random.randint(1, 5),
+                is_active=self.random.random() < 0.9,
+            ) for _ in range(count)
+        )
+        return self.bulk_insert(Testimonial, rows, count)
+
+    def messages(self, count):
+        statuses = [value for value, _ in ContactMessage.STATUS_CHOICES]
+        rows = (
+            ContactMessage(
+                name=f'Sender {i}',
+                email=f'sender{i}@example.com',
+                subject=self.sentence(4),
+                message=self.sentence(40),
+                status=self.random.choice(statuses),
+                is_read=self.random.random() < 0.7,
+            ) for i in range(count)
+        )
+        return self.bulk_insert(ContactMessage, rows, count)
+
+    def contact_info(self):
+        return ContactInformation.objects.create(
+            address='123 Business Street, New York, NY 10001',
+            email='contact@company.com',
+            phone='+1 (555) 123-4567',
+            working_hours='Mon - Fri: 9:00 AM - 6:00 PM',
+        )
+
+    def spread_created_at(self, models, days=365):
+        # auto_now_add stamps a whole batch with one time; spread rows out
+        # deterministically so ordering and keyset pagination are realistic
+        minutes = days * 24 * 60
+        seed = self.random.randrange(1, 1 << 30)
+        with connection.cursor() as cursor:
+            for model in models:
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(
+                    f"UPDATE {table} SET created_at = datetime("
+                    f"'{self.today.isoformat()}', '-' || ((id * %s) %% %s) || ' minutes')",
+                    [seed, minutes],
+                )
+
+    @staticmethod
+    def clear(models):
+        # Plain DELETEs: the ORM would load every row to run signal handlers
+        Through = Project.team_members.through
+        with connection.cursor() as cursor:
+            for model in (Through, *models):
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+    @staticmethod
+    def invalidate(models):
+        # bulk_create and raw SQL bypass the cache and search index signals
+        for model in models:
+            bump_model_version(model)
+        rebuild_index()
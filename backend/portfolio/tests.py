@@ -1,3 +1,1206 @@
-from django.test import TestCase
+import gzip
+import json
+import re
+import tempfile
+from datetime import date
+from io import StringIO
+from pathlib import Path
+from time import sleep
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.handlers.base import BaseHandler
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models.signals import m2m_changed
+from django.test import RequestFactory, override_settings
+from django.test.signals import setting_changed
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from . import fast
+from .authentication import ClaimsTokenObtainPairSerializer
+from .cache import cache_stats, get_model_version
+from .handlers import MiddlewareProfile, SplitWSGIHandler
+from .images import derivative_names
+from .ingest import get_queue
+from .loadtest import SCENARIOS, compare, uncovered_routes
+from .metrics import metrics
+from .models import ContactMessage, Employee, Project, Service, Testimonial
+from .profiling import list_reports, load_report, stats_path
+from .renderers import FastJSONRenderer
+from .serializers import ServiceSerializer
+from .routers import ReadOnlyRouter, reset_read_only, set_read_only
+from .search import rebuild_index
+from .query_budget import QueryBudgetExceeded, assert_max_queries
+
+# Sampled request records would otherwise land in the test output; tests that
+# check them override the rate again
+quiet_request_log = override_settings(PORTFOLIO_REQUEST_LOG_SAMPLE_RATE=0)
+
+
+def setUpModule():
+    quiet_request_log.enable()
+
+
+def tearDownModule():
+    quiet_request_log.disable()
+
+
+def create_employee(name='Jane Smith', **kwargs):
+    defaults = {
+        'name': name,
+        'designation': 'Developer',
+        'department': 'DEVELOPMENT',
+        'bio': 'Bio',
+        'email': 'jane@example.com',
+    }
+    defaults.update(kwargs)
+    return Employee.objects.create(**defaults)
+
+
+def create_project(title='Project', team=(), **kwargs):
+    defaults = {
+        'title': title,
+        'description': 'Description',
+        'category': 'Web Development',
+        'client': 'Client',
+        'start_date': date(2024, 1, 1),
+        'status': 'ONGOING',
+        'technologies': ['Django', 'React'],
+    }
+    defaults.update(kwargs)
+    project = Project.objects.create(**defaults)
+    project.team_members.add(*team)
+    return project
+
+
+class QueryBudgetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        employees = [create_employee(f'Employee {i}') for i in range(3)]
+        for i in range(5):
+            create_project(f'Project {i}', team=employees)
+
+    def test_project_list_does_not_scale_with_rows(self):
+        with assert_max_queries(3, 'project list'):
+            response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_project_detail_within_budget(self):
+        project = Project.objects.first()
+        with assert_max_queries(3, 'project detail'):
+            response = self.client.get(reverse('project-detail', args=[project.pk]))
+        self.assertEqual(len(response.data['team_members']), 3)
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_RAISE=True)
+    def test_staff_token_fits_every_budget(self):
+        staff = User.objects.create_user('staff', is_staff=True)
+        token = ClaimsTokenObtainPairSerializer.get_token(staff).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+        ContactMessage.objects.create(name='N', email='n@example.com', subject='Hi', message='Hello')
+        Testimonial.objects.create(name='Client', position='CTO', company='Co', content='Great')
+        for basename, model in [('service', Service), ('employee', Employee), ('project', Project),
+                                ('contactmessage', ContactMessage), ('testimonial', Testimonial)]:
+            detail = reverse(f'{basename}-detail', args=[model.objects.first().pk])
+            for url, params in [(reverse(f'{basename}-list'), None), (reverse(f'{basename}-list'), {'page': 1}),
+                                (detail, None)]:
+                with self.subTest(f'{url} {params}'):
+                    # Every request pays for the auth version lookup
+                    cache.clear()
+                    self.assertEqual(self.client.get(url, params).status_code, 200)
+        cache.clear()
+        self.assertEqual(self.client.get(reverse('contactinformation-list')).status_code, 200)
+        cache.clear()
+        url = reverse('project-update-team-members', args=[Project.objects.first().pk])
+        response = self.client.post(url, {'replace': [create_employee('New hire').pk]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_assert_max_queries_raises_over_budget(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            with assert_max_queries(0):
+                list(Project.objects.all())
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.service = Service.objects.create(title='Web', description='Sites', icon='faCode')
+
+    def test_second_request_is_served_from_cache(self):
+        url = reverse('service-list')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        with assert_max_queries(0):
+            response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()[0]['title'], 'Web')
+        self.assertEqual(cache_stats(['service'])['service'], {'hits': 1, 'misses': 1})
+
+    def test_save_invalidates_cached_responses(self):
+        url = reverse('service-list')
+        self.client.get(url)
+        self.service.title = 'Web Apps'
+        self.service.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()[0]['title'], 'Web Apps')
+
+    def test_invalidated_again_after_commit(self):
+        url = reverse('service-list')
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.title = 'Web Apps'
+            self.service.save()
+            # Stands in for another request caching the rows before the commit
+            self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'api.example.com'])
+    def test_hosts_are_cached_separately(self):
+        Service.objects.create(title='Mobile', description='Apps', icon='faMobile')
+        for host in ('testserver', 'api.example.com'):
+            response = self.client.get(reverse('service-list'), {'page': 1, 'page_size': 1}, HTTP_HOST=host)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertTrue(response.json()['next'].startswith(f'http://{host}/'))
+
+    def test_filters_are_cached_separately(self):
+        create_employee('Dev', department='DEVELOPMENT')
+        create_employee('Designer', department='DESIGN')
+        url = reverse('employee-list')
+        self.client.get(url, {'department': 'DESIGN'})
+        response = self.client.get(url, {'department': 'DEVELOPMENT'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual([e['name'] for e in response.json()], ['Dev'])
+
+    def test_team_membership_change_invalidates_projects(self):
+        employee = create_employee()
+        project = create_project()
+        url = reverse('project-detail', args=[project.pk])
+        self.client.get(url)
+        project.team_members.add(employee)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.json()['team_members']), 1)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+
+    def test_matching_etag_returns_304_without_queries(self):
+        url = reverse('service-list')
+        etag = self.client.get(url)['ETag']
+        with assert_max_queries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+    def test_if_modified_since(self):
+        url = reverse('service-list')
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_change_produces_new_etag(self):
+        url = reverse('service-list')
+        etag = self.client.get(url)['ETag']
+        Service.objects.create(title='Mobile', description='Apps', icon='faMobile')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_nested_payloads_do_not_send_last_modified(self):
+        project = create_project()
+        response = self.client.get(reverse('project-detail', args=[project.pk]))
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_missing_detail_is_still_404(self):
+        response = self.client.get(reverse('service-detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+
+
+class RequestLogTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+
+    @override_settings(PORTFOLIO_REQUEST_LOG_SAMPLE_RATE=1)
+    def test_sampled_request_is_logged(self):
+        with self.assertLogs('portfolio.requests', 'INFO') as logs:
+            response = self.client.get(reverse('service-list'))
+        record = logs.records[0]
+        self.assertEqual(record.endpoint, 'service-list')
+        self.assertEqual(record.rows, 1)
+        self.assertEqual(record.bytes, len(response.content))
+        self.assertGreaterEqual(record.queries, 1)
+
+    @override_settings(PORTFOLIO_REQUEST_LOG_SAMPLE_RATE=1, PORTFOLIO_FAST_SERIALIZATION=False)
+    def test_serialize_time_is_measured_directly(self):
+        represent = ServiceSerializer.to_representation
+
+        def slow_representation(serializer, instance):
+            sleep(0.02)
+            return represent(serializer, instance)
+
+        with patch('rest_framework.views.APIView.check_permissions', lambda view, request: sleep(0.05)), \
+                patch.object(ServiceSerializer, 'to_representation', slow_representation), \
+                self.assertLogs('portfolio.requests', 'INFO') as logs:
+            self.client.get(reverse('service-list'))
+            self.client.get(reverse('service-detail', args=[999]))
+        served, missing = logs.records
+        self.assertGreaterEqual(served.serialize_ms, 20)
+        self.assertLess(served.serialize_ms, 50)
+        self.assertGreaterEqual(served.total_ms, 70)
+        self.assertEqual(missing.rows, 0)
+
+    @override_settings(PORTFOLIO_REQUEST_LOG_SAMPLE_RATE=0)
+    def test_disabled_sampling_logs_nothing(self):
+        with self.assertNoLogs('portfolio.requests', 'INFO'):
+            self.client.get(reverse('service-list'))
+
+
+class PaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            create_project(f'Project {i}')
+
+    def test_lists_are_unpaginated_by_default(self):
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(len(response.json()), 5)
+
+    def test_page_number_pagination(self):
+        response = self.client.get(reverse('project-list'), {'page': 2, 'page_size': 2})
+        data = response.json()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['results']), 2)
+
+    def test_cursor_pagination_walks_every_row_without_count(self):
+        url = reverse('project-list')
+        params = {'pagination': 'cursor', 'page_size': 2}
+        seen = []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                data = self.client.get(url, params).json()
+            self.assertFalse(any('COUNT' in q['sql'] for q in queries.captured_queries[1:]))
+            self.assertNotIn('count', data)
+            seen += [project['title'] for project in data['results']]
+            url, params = data['next'], None
+        self.assertEqual(seen, [f'Project {i}' for i in reversed(range(5))])
+
+    def test_contact_messages_are_paginated_by_default(self):
+        ContactMessage.objects.bulk_create(
+            ContactMessage(name='N', email='n@example.com', subject=f'Hi {i}', message='Hello') for i in range(3)
+        )
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        with patch('portfolio.pagination.MessageCursorPagination.page_size', 2):
+            data = self.client.get(reverse('contactmessage-list')).json()
+            self.assertEqual(len(data['results']), 2)
+            data = self.client.get(data['next']).json()
+            self.assertEqual([message['subject'] for message in data['results']], ['Hi 0'])
+            response = self.client.get(reverse('contactmessage-list'), {'stream': 1})
+            self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 3)
+
+
+class SyntheticSeedTests(APITestCase):
+    def seed(self):
+        call_command(
+            'seed_data', synthetic=True, services=2, employees=20, projects=30,
+            team_size=4, testimonials=5, seed=7, stdout=StringIO(),
+        )
+        return list(Project.objects.order_by('pk').values_list('title', 'category', 'status'))
+
+    def test_synthetic_seed_is_deterministic(self):
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            first = self.seed()
+            second = self.seed()
+        self.assertEqual(len(first), 30)
+        self.assertEqual(first, second)
+        self.assertEqual(Project.team_members.through.objects.count(), 30 * 4)
+        self.assertTrue(Employee.objects.exclude(image='').exists())
+
+    def test_synthetic_seed_keeps_real_messages(self):
+        message = ContactMessage.objects.create(name='N', email='n@example.com', subject='Hi', message='Hello')
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            self.seed()
+        self.assertEqual(ContactMessage.objects.get(pk=message.pk).created_at, message.created_at)
+
+
+class ImageFetchSeedTests(APITestCase):
+    photos = [
+        'photo-1560250097-0b93528c311a', 'photo-1573496359142-b8d87734a5a2',
+        'photo-1472099645785-5658abf4ff4e', 'photo-1580489944761-15a19d654956',
+        'photo-1661956602116-aa6865609028', 'photo-1555421689-491a97ff2040',
+        'photo-1576091160399-112ba8d25d1d',
+    ]
+
+    def test_demo_seed_runs_offline_and_reuses_cached_files(self):
+        with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as media_root:
+            for i, photo in enumerate(self.photos):
+                # Two photos share bytes and must share one stored file
+                Path(source, photo).write_bytes(b'jpeg-%d' % min(i, 5))
+            with self.settings(MEDIA_ROOT=media_root):
+                call_command('seed_data', image_source=source, stdout=StringIO())
+                stored = sorted(Path(media_root).rglob('*.jpg'))
+                mtimes = [path.stat().st_mtime_ns for path in stored]
+                call_command('seed_data', image_source=source, stdout=StringIO())
+
+            self.assertEqual(len(stored), 6)
+            self.assertEqual(sorted(Path(media_root).rglob('*.jpg')), stored)
+            self.assertEqual([path.stat().st_mtime_ns for path in stored], mtimes)
+        self.assertEqual(Employee.objects.count(), 4)
+        self.assertTrue(all(name.startswith('image-cache/') for name in
+                            Project.objects.values_list('image', flat=True)))
+
+
+class ImageDerivativeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.media_root.cleanup)
+        overrides = self.settings(
+            MEDIA_ROOT=self.media_root.name,
+            PORTFOLIO_IMAGE_WIDTHS=(100, 400),
+            PORTFOLIO_IMAGE_FORMATS=('webp', 'jpeg'),
+            PORTFOLIO_IMAGE_DERIVATIVES_SYNC=True,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def upload(self, employee=None, execute=True):
+        from PIL import Image
+
+        buffer = tempfile.SpooledTemporaryFile()
+        Image.new('RGB', (200, 100), 'red').save(buffer, 'PNG')
+        buffer.seek(0)
+        if employee is None:
+            employee = Employee(name='Jane', designation='Dev', department='DESIGN', bio='', email='j@example.com')
+        with self.captureOnCommitCallbacks(execute=execute):
+            employee.image.save('jane.png', ContentFile(buffer.read()))
+        return employee
+
+    def srcset(self, employee):
+        cache.clear()
+        return self.client.get(reverse('employee-detail', args=[employee.pk])).json()['image_srcset']
+
+    def test_saving_an_image_writes_every_derivative(self):
+        employee = self.upload()
+        names = derivative_names(employee.image.name)
+        self.assertEqual(len(names), 4)
+        for width, fmt, name in names:
+            self.assertTrue(default_storage.exists(name), name)
+
+    def test_serializer_exposes_srcset(self):
+        employee = self.upload()
+        data = self.client.get(reverse('employee-detail', args=[employee.pk])).json()
+        self.assertEqual(set(data['image_srcset']), {'webp', 'jpeg'})
+        self.assertIn('/100w.webp 100w, ', data['image_srcset']['webp'])
+        self.assertTrue(data['image_srcset']['jpeg'].endswith('/400w.jpg 400w'))
+
+    def test_srcset_waits_for_the_derivatives(self):
+        employee = self.upload(execute=False)
+        self.assertIsNone(self.srcset(employee))
+        self.assertIsNone(self.client.get(reverse('employee-list')).json()[0]['image_srcset'])
+        self.upload(employee)
+        self.assertIn(employee.image.name.rsplit('.', 1)[0], self.srcset(employee)['webp'])
+
+    def test_regenerates_only_when_the_image_changes(self):
+        employee = self.upload()
+        employee.refresh_from_db()
+        with patch('portfolio.signals.schedule_derivatives') as schedule:
+            employee.designation = 'Lead'
+            employee.save()
+            schedule.assert_not_called()
+            first = employee.image.name
+            self.upload(employee, execute=False)
+        schedule.assert_called_once_with(employee.image.name)
+        self.assertNotEqual(employee.image.name, first)
+        # The old image's derivatives are no longer advertised
+        self.assertIsNone(self.srcset(employee))
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        team = [create_employee(f'Employee {i}') for i in range(2)]
+        for i in range(3):
+            create_project(f'Project {i}', team=team)
+
+    def test_default_response_is_unchanged(self):
+        project = self.client.get(reverse('project-list')).json()[0]
+        self.assertIn('description', project)
+        self.assertEqual(project['team_members'][0]['bio'], 'Bio')
+
+    def test_fields_limits_output_and_columns(self):
+        url = reverse('project-list')
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url, {'fields': 'id,title'}).json()
+        self.assertEqual(set(data[0]), {'id', 'title'})
+        rows_query = queries.captured_queries[-1]['sql']
+        self.assertNotIn('description', rows_query)
+        self.assertFalse(any('portfolio_employee' in q['sql'] for q in queries.captured_queries))
+
+    def test_slim_list_uses_card_fields_and_ids(self):
+        data = self.client.get(reverse('project-list'), {'fields': ''}).json()
+        self.assertNotIn('description', data[0])
+        self.assertEqual(len(data[0]['team_members']), 2)
+        self.assertIsInstance(data[0]['team_members'][0], int)
+
+    def test_expand_nests_slim_team_members(self):
+        data = self.client.get(reverse('project-list'), {'fields': 'title,team_members', 'expand': 'team_members'}).json()
+        member = data[0]['team_members'][0]
+        self.assertEqual(member['name'], 'Employee 0')
+        self.assertNotIn('bio', member)
+
+
+class FastSerializationParityTests(APITestCase):
+    """The fast read path must produce exactly the bytes DRF produces."""
+
+    def setUp(self):
+        cache.clear()
+        team = [
+            create_employee('Zoë Ångström', bio='Line\u2028separated \U0001f600', image='employees/z.jpg'),
+            create_employee('Same Name', department='DESIGN', phone='', email='a@example.com'),
+            create_employee('Same Name', department='DESIGN', email='b@example.com'),
+            create_employee('Inactive', is_active=False),
+        ]
+        create_project('Überproject', team=team, image='projects/p.jpg', technologies=['Django', {'nested': [1, None]}])
+        create_project('Empty team', status='COMPLETED', end_date=date(2024, 6, 1))
+        create_project('Design job', category='UI/UX Design', team=team[1:3])
+        Service.objects.create(title='Web', description='"quoted" <b>', icon='faCode')
+        Testimonial.objects.create(name='A', position='CEO', company='Co', content='Great', rating=4)
+        Testimonial.objects.create(name='B', position='CTO', company='Co', content='Fine', rating=5, image='testimonials/b.jpg')
+        ContactMessage.objects.create(name='N', email='n@example.com', subject='Hi', message='Hello\nthere')
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+
+    def fetch(self, url, params, fast):
+        cache.clear()
+        with self.settings(PORTFOLIO_FAST_SERIALIZATION=fast):
+            return self.client.get(url, params)
+
+    def assertParity(self, name, params=None):
+        url = reverse(name)
+        baseline = self.fetch(url, params, fast=False)
+        fast = self.fetch(url, params, fast=True)
+        self.assertEqual(baseline.status_code, 200)
+        expected = JSONRenderer().render(baseline.data)
+        self.assertEqual(fast.content, expected)
+        self.assertEqual(FastJSONRenderer().render(baseline.data), expected)
+
+    def test_public_lists(self):
+        for name in ('service-list', 'employee-list', 'project-list', 'testimonial-list'):
+            with self.subTest(name):
+                self.assertParity(name)
+
+    def test_filters(self):
+        self.assertParity('employee-list', {'department': 'DESIGN'})
+        self.assertParity('project-list', {'status': 'COMPLETED'})
+        self.assertParity('project-list', {'category': 'UI/UX Design'})
+        self.assertParity('testimonial-list', {'rating': 5})
+
+    def test_sparse_fieldsets(self):
+        self.assertParity('project-list', {'fields': ''})
+        self.assertParity('project-list', {'fields': 'title,team_members', 'expand': 'team_members'})
+        self.assertParity('employee-list', {'fields': 'name,image,image_srcset'})
+
+    def test_authenticated_contact_messages(self):
+        self.client.force_authenticate(self.staff)
+        self.assertParity('contactmessage-list')
+
+    def test_streamed_lists_match(self):
+        self.client.force_authenticate(self.staff)
+        for name in ('project-list', 'employee-list', 'contactmessage-list'):
+            data = self.fetch(reverse(name), None, fast=False).data
+            if isinstance(data, dict):
+                # Messages come in pages unless streamed
+                data = data['results']
+            expected = JSONRenderer().render(data)
+            for fast in (True, False):
+                with self.subTest(name, fast=fast), self.settings(PORTFOLIO_STREAM_CHUNK_SIZE=2):
+                    response = self.fetch(reverse(name), {'stream': 1}, fast=fast)
+                    self.assertTrue(response.streaming)
+                    self.assertEqual(b''.join(response.streaming_content), expected)
+
+    def test_plan_cache_is_bounded(self):
+        url = reverse('project-list')
+        fast._plans.clear()
+        for i in range(20):
+            self.assertParity('project-list', {'fields': f'title,bogus{i}', 'expand': f'team_members,x{i}'})
+        self.assertEqual(len(fast._plans), 1)
+        with self.settings(PORTFOLIO_SERIALIZATION_PLANS=2):
+            for fields in ('id', 'title', 'client'):
+                self.client.get(url, {'fields': fields})
+        self.assertEqual(len(fast._plans), 2)
+
+    def test_fast_path_uses_fewer_queries(self):
+        url = reverse('project-list')
+        with CaptureQueriesContext(connection) as queries:
+            self.fetch(url, None, fast=True)
+        # Validators, projects, and team members joined through the link table
+        self.assertEqual(len(queries.captured_queries), 3)
+
+
+class BundleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        team = [create_employee('Jane'), create_employee('John')]
+        create_project('Site', team=team)
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+        Testimonial.objects.create(name='A', position='CEO', company='Co', content='Great')
+
+    def test_bundle_matches_individual_endpoints(self):
+        bundle = self.client.get(reverse('bundle')).json()
+        for section, name in [('services', 'service-list'), ('employees', 'employee-list'),
+                              ('projects', 'project-list'), ('testimonials', 'testimonial-list'),
+                              ('contact_info', 'contactinformation-list')]:
+            with self.subTest(section):
+                self.assertEqual(bundle[section], self.client.get(reverse(name)).json())
+
+    def test_warm_bundle_costs_no_queries(self):
+        url = reverse('bundle')
+        etag = self.client.get(url)['ETag']
+        with assert_max_queries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_only_changed_sections_are_rebuilt(self):
+        url = reverse('bundle')
+        self.client.get(url)
+        Service.objects.create(title='Mobile', description='Apps', icon='faMobile')
+        with CaptureQueriesContext(connection) as queries:
+            bundle = self.client.get(url).json()
+        self.assertEqual(len(bundle['services']), 2)
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertIn('portfolio_service', queries.captured_queries[0]['sql'])
+
+
+class StaticExportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        create_project('Site', team=[create_employee('Jane')], category='Web')
+        Testimonial.objects.create(name='A', position='CEO', company='Co', content='Great', rating=4)
+        self.root = Path(tempfile.mkdtemp())
+
+    def test_export_matches_live_endpoints(self):
+        call_command('export_static_json', root=str(self.root), base_url='http://testserver', stdout=StringIO(), stderr=StringIO())
+        current = self.root / 'current'
+        manifest = json.loads((current / 'manifest.json').read_text())
+        for url in ['/api/projects/', '/api/projects/?category=Web', '/api/testimonials/?rating=4',
+                    '/api/employees/?department=DEVELOPMENT', '/api/bundle/']:
+            with self.subTest(url):
+                entry = manifest[url]
+                body = (current / entry['file']).read_bytes()
+                self.assertEqual(json.loads(body), self.client.get(url).json())
+                self.assertEqual(gzip.decompress((current / entry['encodings']['gzip']).read_bytes()), body)
+        self.assertNotIn('/api/contact-messages/', manifest)
+
+    def test_reexport_swaps_current_release(self):
+        call_command('export_static_json', root=str(self.root), base_url='http://testserver', stdout=StringIO(), stderr=StringIO())
+        first = (self.root / 'current').resolve()
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+        call_command('export_static_json', root=str(self.root), base_url='http://testserver', stdout=StringIO(), stderr=StringIO())
+        second = (self.root / 'current').resolve()
+        self.assertNotEqual(first, second)
+        manifest = json.loads((second / 'manifest.json').read_text())
+        self.assertEqual(len(json.loads((second / manifest['/api/services/']['file']).read_text())), 1)
+
+
+@override_settings(PORTFOLIO_COMPRESSION_MIN_SIZE=100)
+class CompressionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for index in range(5):
+            Service.objects.create(title=f'Service {index}', description='Sites ' * 20, icon='faCode')
+        self.url = reverse('service-list')
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/'))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), self.client.get(self.url).json())
+
+    def test_negotiation(self):
+        from .compression import brotli, negotiate_encoding
+        self.assertIsNone(negotiate_encoding(''))
+        self.assertIsNone(negotiate_encoding('identity, gzip;q=0'))
+        self.assertEqual(negotiate_encoding('br;q=0.5, gzip'), 'gzip')
+        self.assertEqual(negotiate_encoding('gzip, br'), 'br' if brotli else 'gzip')
+
+    def test_small_and_streamed_responses(self):
+        with self.settings(PORTFOLIO_COMPRESSION_MIN_SIZE=100000):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        cache.clear()
+        response = self.client.get(self.url, {'stream': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(json.loads(body), self.client.get(self.url).json())
+
+    def test_bundle_revalidates_through_compression(self):
+        url = reverse('bundle')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertTrue(response.has_header('Content-Encoding'))
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_only_api_responses_without_secrets(self):
+        def get(url, params=None):
+            response = self.client.get(url, params, HTTP_ACCEPT_ENCODING='gzip, br')
+            self.assertEqual(response.status_code, 200)
+            self.assertGreater(len(response.content), 512)
+            return response
+
+        self.assertFalse(get(reverse('admin:login')).has_header('Content-Encoding'))
+        self.client.force_login(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        self.assertFalse(get(reverse('admin:portfolio_service_changelist')).has_header('Content-Encoding'))
+        # The browsable API embeds a CSRF token in its forms
+        self.assertFalse(get(self.url, {'format': 'api'}).has_header('Content-Encoding'))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertTrue(response.has_header('Content-Encoding'))
+
+class AsyncReadViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        team = [create_employee('Jane', image='employees/j.jpg'), create_employee('John', department='DESIGN')]
+        self.project = create_project('Site', team=team, category='Web')
+        Service.objects.create(title='Web', description='Sites', icon='faCode')
+        Testimonial.objects.create(name='A', position='CEO', company='Co', content='Great', rating=4)
+
+    async def test_matches_sync_endpoints(self):
+        cases = [('service', {}), ('employee', {'department': 'DESIGN'}), ('project', {}),
+                 ('project', {'category': 'Web'}), ('testimonial', {'rating': 4}),
+                 ('contactinformation', {})]
+        for basename, params in cases:
+            with self.subTest(basename, **params):
+                expected = await self.async_client.get(reverse(f'{basename}-list'), params)
+                response = await self.async_client.get(reverse(f'async-{basename}-list'), params)
+                self.assertEqual(response.content, expected.content)
+        url = reverse('async-project-detail', args=[self.project.pk])
+        expected = await self.async_client.get(reverse('project-detail', args=[self.project.pk]))
+        self.assertEqual((await self.async_client.get(url)).content, expected.content)
+
+    @override_settings(PORTFOLIO_FAST_SERIALIZATION=False)
+    async def test_serializer_fallback(self):
+        for basename in ('service', 'project'):
+            pk = self.project.pk if basename == 'project' else (await Service.objects.afirst()).pk
+            for name, args in (('list', []), ('detail', [pk])):
+                with self.subTest(f'{basename}-{name}'):
+                    expected = await self.async_client.get(reverse(f'{basename}-{name}', args=args))
+                    response = await self.async_client.get(reverse(f'async-{basename}-{name}', args=args))
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.content, expected.content)
+
+    @override_settings(PORTFOLIO_FAST_SERIALIZATION=False)
+    def test_serializer_fallback_prefetches_team(self):
+        create_project('Other', team=[create_employee('Ann')])
+        # The projects, then every team member in one prefetch
+        with self.assertNumQueries(2):
+            self.client.get(reverse('async-project-list'))
+
+    async def test_cached_and_invalidated(self):
+        url = reverse('async-project-list')
+        self.assertEqual((await self.async_client.get(url))['X-Cache'], 'MISS')
+        self.assertEqual((await self.async_client.get(url))['X-Cache'], 'HIT')
+        await Project.objects.filter(pk=self.project.pk).aupdate(title='Renamed')
+        await sync_to_async(self.project.team_members.clear)()
+        response = await self.async_client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)[0]['team_members'], [])
+
+    async def test_missing_object(self):
+        response = await self.async_client.get(reverse('async-service-detail', args=[999]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content), {'detail': 'No Service matches the given query.'})
+
+
+class ContactQueueTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.override = override_settings(
+            PORTFOLIO_CONTACT_QUEUE_PATH=Path(tempfile.mkdtemp()) / 'contact.sqlite3',
+            PORTFOLIO_CONTACT_QUEUE_SYNC=True,
+        )
+        self.override.enable()
+        self.addCleanup(self.override.disable)
+        self.url = reverse('contactmessage-list')
+        self.payload = {'name': 'N', 'email': 'n@example.com', 'subject': 'Hi', 'message': 'Hello'}
+
+    def test_submission_is_accepted_then_stored(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(self.url, self.payload)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertFalse(ContactMessage.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(ContactMessage.objects.get().subject, 'Hi')
+        self.assertEqual(get_queue().depth(), 0)
+
+    def test_duplicates_are_dropped(self):
+        ContactMessage.objects.create(**dict(self.payload, subject='Earlier'))
+        with self.captureOnCommitCallbacks(execute=True):
+            for payload in (self.payload, self.payload, dict(self.payload, subject='Earlier ')):
+                self.client.post(self.url, payload)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+
+    def test_invalid_submission_is_rejected(self):
+        response = self.client.post(self.url, dict(self.payload, email='nope'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(get_queue().depth(), 0)
+
+    def test_backpressure_and_rate_limit(self):
+        with self.settings(PORTFOLIO_CONTACT_QUEUE_MAX_DEPTH=1):
+            self.assertEqual(self.client.post(self.url, self.payload).status_code, 202)
+            response = self.client.post(self.url, self.payload)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+        statuses = [self.client.post(self.url, self.payload).status_code for _ in range(5)]
+        self.assertEqual(statuses[-1], 429)
+
+
+class SQLiteProfileTests(APITestCase):
+    def test_connection_pragmas(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -20000)
+
+    def test_read_only_router(self):
+        router = ReadOnlyRouter()
+        self.assertEqual(router.db_for_read(Project), 'default')
+        token = set_read_only(True)
+        try:
+            # Test cases run inside a transaction, which must read its own writes
+            self.assertEqual(router.db_for_read(Project), 'default')
+            with patch.object(connection, 'in_atomic_block', False):
+                self.assertEqual(router.db_for_read(Project), 'readonly')
+                self.assertEqual(router.db_for_write(Project), 'default')
+        finally:
+            reset_read_only(token)
+        self.assertFalse(router.allow_migrate('readonly', 'portfolio'))
+
+
+class BulkMessageUpdateTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.messages = [
+            ContactMessage.objects.create(name=f'N{i}', email='n@example.com', subject='Hi', message=str(i))
+            for i in range(4)
+        ]
+        ContactMessage.objects.filter(pk=self.messages[3].pk).update(status='ARCHIVED')
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_authenticate(self.staff)
+        self.url = reverse('contactmessage-bulk-update')
+
+    def test_update_by_ids_in_one_query(self):
+        ids = [message.pk for message in self.messages[:2]]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'ids': ids, 'status': 'COMPLETED', 'is_read': True}, format='json')
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(
+            set(ContactMessage.objects.filter(status='COMPLETED', is_read=True).values_list('pk', flat=True)),
+            set(ids),
+        )
+
+    def test_update_by_filter_bumps_cache_version(self):
+        version = get_model_version(ContactMessage)
+        response = self.client.post(self.url, {'filter': {'status': 'NEW'}, 'is_read': True}, format='json')
+        self.assertEqual(response.json(), {'updated': 3})
+        self.assertGreater(get_model_version(ContactMessage), version)
+        self.assertFalse(ContactMessage.objects.get(status='ARCHIVED').is_read)
+
+    def test_validation(self):
+        for payload in ({'status': 'COMPLETED'}, {'ids': [1], 'filter': {}, 'status': 'COMPLETED'},
+                        {'ids': [1]}, {'ids': [1], 'status': 'BOGUS'}, {'filter': {}, 'is_read': True},
+                        {'filter': {'unknown': 1}, 'is_read': True}):
+            with self.subTest(payload):
+                self.assertEqual(self.client.post(self.url, payload, format='json').status_code, 400)
+        self.assertFalse(ContactMessage.objects.filter(is_read=True).exists())
+
+    def test_admin_action(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        response = self.client.post(reverse('admin:portfolio_contactmessage_changelist'), {
+            'action': 'mark_archived',
+            '_selected_action': [self.messages[0].pk, self.messages[1].pk],
+        }, follow=True)
+        self.assertContains(response, '2 message(s) archived.')
+        self.assertEqual(ContactMessage.objects.filter(status='ARCHIVED').count(), 3)
+
+
+class TeamMembershipTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employees = [create_employee(name) for name in ('Dan', 'Ann', 'Cat', 'Bob')]
+        self.project = create_project('Site', team=self.employees[:2])
+        self.client.force_authenticate(User.objects.create_user('staff', password='pw', is_staff=True))
+        self.url = reverse('project-update-team-members', args=[self.project.pk])
+        self.signals = []
+        handler = lambda sender, action, pk_set, **kwargs: self.signals.append((action, pk_set))
+        m2m_changed.connect(handler, sender=Project.team_members.through, weak=False)
+        self.addCleanup(m2m_changed.disconnect, handler, sender=Project.team_members.through)
+
+    def test_add_and_remove(self):
+        dan, ann, cat, bob = self.employees
+        response = self.client.post(self.url, {'add': [cat.pk, bob.pk, ann.pk], 'remove': [dan.pk]}, format='json')
+        self.assertEqual(response.json(), {'team_members': [ann.pk, bob.pk, cat.pk]})
+        self.assertEqual(self.signals, [('post_remove', {dan.pk}), ('post_add', {cat.pk, bob.pk})])
+        project = self.client.get(reverse('project-detail', args=[self.project.pk])).json()
+        self.assertEqual([member['id'] for member in project['team_members']], [ann.pk, bob.pk, cat.pk])
+
+    def test_replace_in_one_transaction(self):
+        dan, ann, cat, bob = self.employees
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'replace': [ann.pk, cat.pk]}, format='json')
+        self.assertEqual(response.json(), {'team_members': [ann.pk, cat.pk]})
+        self.assertEqual(self.signals, [('post_remove', {dan.pk}), ('post_add', {cat.pk})])
+        # Project, id check, current team, DELETE, INSERT and the savepoint pair
+        self.assertLessEqual(len(queries.captured_queries), 7)
+
+    def test_unknown_ids_change_nothing(self):
+        response = self.client.post(self.url, {'add': [self.employees[2].pk, 999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['ids'], [999])
+        self.assertEqual(self.project.team_members.count(), 2)
+        self.assertEqual(self.signals, [])
+
+    def test_validation(self):
+        for payload in ({}, {'replace': [1], 'add': [2]}, {'add': [1], 'remove': [1]}):
+            with self.subTest(payload):
+                self.assertEqual(self.client.post(self.url, payload, format='json').status_code, 400)
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.project = create_project('Django storefront', description='Payments and shipping', category='Web')
+        create_project('Mobile banking', description='Built with Django REST framework')
+        create_employee('Ada Lovelace', bio='Writes Django apps', email='ada@analytical.org')
+        create_employee('Hidden Person', bio='Django too', is_active=False)
+        Service.objects.create(title='Consulting', description='Architecture reviews', icon='faCode')
+        self.url = reverse('search')
+
+    def test_ranked_prefix_search(self):
+        results = self.client.get(self.url, {'q': 'djan'}).json()
+        # Title matches outrank body matches; inactive employees are not public
+        self.assertEqual(results[0], dict(results[0], type='project', id=self.project.pk, title='Django storefront'))
+        self.assertEqual({result['type'] for result in results}, {'project', 'employee'})
+        self.assertNotIn('Hidden Person', [result['title'] for result in results])
+        self.assertEqual(len(self.client.get(self.url, {'q': 'django rest'}).json()), 1)
+        self.assertEqual(self.client.get(self.url, {'q': '"*'}).json(), [])
+
+    def test_type_filter_and_validation(self):
+        results = self.client.get(self.url, {'q': 'django', 'type': 'employee'}).json()
+        self.assertEqual([result['title'] for result in results], ['Ada Lovelace'])
+        self.assertEqual(self.client.get(self.url, {'q': 'django', 'type': 'user'}).status_code, 400)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.project.title = 'Renamed shop'
+        self.project.save()
+        self.assertEqual(self.client.get(self.url, {'q': 'renamed'}).json()[0]['id'], self.project.pk)
+        self.assertEqual(self.client.get(self.url, {'q': 'storefront'}).json(), [])
+        self.project.delete()
+        self.assertEqual(self.client.get(self.url, {'q': 'renamed'}).json(), [])
+
+    def test_admin_search_uses_index(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        response = self.client.get(reverse('admin:portfolio_employee_changelist'), {'q': 'djan'})
+        self.assertContains(response, 'Ada Lovelace')
+        self.assertContains(response, 'Hidden Person')
+        # email is not indexed and falls back to icontains
+        response = self.client.get(reverse('admin:portfolio_employee_changelist'), {'q': 'analytical'})
+        self.assertContains(response, 'Ada Lovelace')
+        self.assertNotContains(response, 'Hidden Person')
+
+    def test_broad_admin_search_stays_in_sql(self):
+        Service.objects.bulk_create(
+            Service(title=f'Common {i}', description='Shared words', icon='faCode') for i in range(40000)
+        )
+        rebuild_index()
+        self.client.force_login(User.objects.create_superuser('admin', 'a@example.com', 'pw'))
+        response = self.client.get(reverse('admin:portfolio_service_changelist'), {'q': 'common'})
+        self.assertContains(response, '40000 results')
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        ContactMessage.objects.create(name='N', email='n@example.com', subject='Hi', message='Hello')
+        response = self.client.post(reverse('token_obtain_pair'), {'username': 'staff', 'password': 'pw'})
+        self.access = response.json()['access']
+        self.url = reverse('contactmessage-list')
+
+    def get(self, token):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims_replace_the_user_query(self):
+        self.assertEqual(self.get(self.access).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(self.access).status_code, 200)
+        self.assertFalse([q for q in queries.captured_queries if 'auth_user' in q['sql']])
+
+    def test_password_change_revokes_tokens(self):
+        self.assertEqual(self.get(self.access).status_code, 200)
+        self.staff.set_password('new')
+        self.staff.save()
+        response = self.get(self.access)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['detail'], 'Token has been revoked')
+
+    def test_tokens_without_claims_load_the_user(self):
+        from rest_framework_simplejwt.tokens import AccessToken
+        self.assertEqual(self.get(str(AccessToken.for_user(self.staff))).status_code, 200)
+
+    def test_anonymous_requests_skip_token_parsing(self):
+        with patch('portfolio.authentication.JWTAuthentication.authenticate') as authenticate:
+            self.assertEqual(self.client.get(reverse('service-list')).status_code, 200)
+            self.assertEqual(self.client.get(self.url).status_code, 401)
+        authenticate.assert_not_called()
+
+
+class MiddlewareSplitTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.handler = SplitWSGIHandler()
+        self.factory = RequestFactory()
+        Service.objects.create(title='Web', description='Sites')
+
+    def test_api_requests_run_the_lean_chain(self):
+        request = self.factory.get(reverse('service-list'))
+        response = self.handler.get_response(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)[0]['title'], 'Web')
+        self.assertFalse(hasattr(request, 'session'))
+        self.assertNotIn('X-Frame-Options', response)
+
+    def test_admin_keeps_the_full_chain(self):
+        request = self.factory.get(reverse('admin:login'))
+        response = self.handler.get_response(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(hasattr(request, 'session'))
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+
+    def test_profile_leaves_settings_alone(self):
+        changed = []
+
+        def record(setting, **kwargs):
+            changed.append(setting)
+
+        setting_changed.connect(record)
+        self.addCleanup(setting_changed.disconnect, record)
+        profile = MiddlewareProfile(settings.PORTFOLIO_API_MIDDLEWARE, is_async=True)
+        self.assertEqual(changed, [])
+        response = async_to_sync(profile.get_response_async)(self.factory.get(reverse('service-list')))
+        self.assertEqual(json.loads(response.content)[0]['title'], 'Web')
+
+    def test_profile_matches_what_django_builds(self):
+        # MiddlewareProfile.load_middleware copies BaseHandler's; this fails
+        # when a Django upgrade changes what the original builds
+        def describe(method):
+            method = getattr(method, '__wrapped__', method)
+            inner = getattr(method, 'func', None) or getattr(method, 'awaitable', None) or method
+            name = getattr(inner, '__qualname__', type(inner).__qualname__)
+            return type(method).__name__, name, iscoroutinefunction(method)
+
+        def shape(handler):
+            chain, layer = [], handler._middleware_chain
+            while layer is not None:
+                chain.append(describe(layer))
+                layer = getattr(getattr(layer, '__wrapped__', layer), 'get_response', None)
+            return chain, [[describe(method) for method in methods] for methods in (
+                handler._view_middleware, handler._template_response_middleware, handler._exception_middleware,
+            )]
+
+        for middleware in (settings.MIDDLEWARE, settings.PORTFOLIO_API_MIDDLEWARE):
+            for is_async in (False, True):
+                with self.subTest(f'{len(middleware)} entries, async={is_async}'):
+                    with self.settings(MIDDLEWARE=middleware):
+                        handler = BaseHandler()
+                        handler.load_middleware(is_async=is_async)
+                    self.assertEqual(shape(MiddlewareProfile(middleware, is_async)), shape(handler))
+
+    @override_settings(PORTFOLIO_API_MIDDLEWARE=None)
+    def test_split_can_be_turned_off(self):
+        request = self.factory.get(reverse('service-list'))
+        SplitWSGIHandler().get_response(request)
+        self.assertTrue(hasattr(request, 'session'))
+
+    def test_timing_report(self):
+        out = StringIO()
+        call_command('profile_middleware', '--requests', '2', '--warmup', '0', '--path', '/api/services/', stdout=out)
+        report = out.getvalue()
+        self.assertIn('SessionMiddleware', report)
+        self.assertIn('api µs', report)
+
+
+@override_settings(PORTFOLIO_METRICS_TOKEN='scrape-token')
+class MetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        Service.objects.create(title='Web', description='Sites')
+
+    def scrape(self):
+        return self.client.get(reverse('metrics'), HTTP_X_METRICS_TOKEN='scrape-token').content.decode()
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('service-list'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('cache;desc="MISS"', timing)
+        self.assertIn('total;dur=', timing)
+        self.assertNotIn('Server-Timing', self.client.get(reverse('admin:login')))
+
+    def test_serialize_timing_excludes_the_rest_of_the_request(self):
+        with patch('rest_framework.views.APIView.check_permissions', lambda view, request: sleep(0.05)):
+            response = self.client.get(reverse('service-list'))
+        timings = dict(re.findall(r'(\w+);dur=([\d.]+)', response['Server-Timing']))
+        self.assertGreaterEqual(float(timings['total']), 50)
+        self.assertLess(float(timings['serialize']), 50)
+        body = self.scrape()
+        serialize = re.search(r'portfolio_request_serialize_seconds_sum\{view="service-list",.*\} (\S+)', body)
+        self.assertLess(float(serialize.group(1)), 0.05)
+
+    def test_histograms_per_action(self):
+        self.client.get(reverse('service-list'))
+        self.client.get(reverse('service-list'))
+        self.client.get(reverse('contactmessage-mark-as-read', args=[1]))
+        body = self.scrape()
+        self.assertIn('portfolio_request_duration_seconds_count{view="service-list",action="list"} 2', body)
+        self.assertIn('portfolio_response_cache_total{view="service-list",action="list",result="hit"} 1', body)
+        self.assertIn('portfolio_requests_total{view="contactmessage-mark-as-read",action="get",status="4xx"} 1',
+                      body)
+        self.assertIn('le="+Inf"', body)
+
+    def test_metrics_are_private(self):
+        url = reverse('metrics')
+        # Behind a local reverse proxy every client comes from 127.0.0.1
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='127.0.0.1').status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_X_METRICS_TOKEN='guess').status_code, 401)
+        with self.settings(PORTFOLIO_METRICS_TOKEN=None):
+            self.assertEqual(self.client.get(url, HTTP_X_METRICS_TOKEN='').status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_X_METRICS_TOKEN='scrape-token').status_code, 200)
+        staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+class BenchmarkHarnessTests(APITestCase):
+    def test_every_route_has_a_scenario(self):
+        self.assertEqual(uncovered_routes(), [])
+
+    def test_compare_flags_regressions(self):
+        def results(p95, queries, errors=0):
+            return {'scenarios': {'projects': {'p95_ms': p95, 'queries': queries, 'errors': errors}}}
+
+        baseline = results(10.0, 3)
+        self.assertEqual(compare(results(11.0, 3), baseline), [])
+        self.assertEqual(compare(results(1.5, 3), results(1.0, 3)), [])
+        self.assertEqual(compare(results(20.0, 3), baseline), ['projects: p95 10.00 ms -> 20.00 ms'])
+        self.assertEqual(compare(results(10.0, 4), baseline), ['projects: 3 -> 4 queries per request'])
+        self.assertEqual(compare(results(10.0, 3, errors=2), baseline), ['projects: 2 unexpected responses'])
+
+    def test_command_writes_results_and_checks_the_baseline(self):
+        options = dict(
+            services=2, employees=6, projects=8, testimonials=4, messages=6,
+            requests=2, warmup=0, memory_requests=1, stdout=StringIO(),
+        )
+        with tempfile.TemporaryDirectory() as directory, self.settings(MEDIA_ROOT=directory):
+            output, baseline = Path(directory) / 'results.json', Path(directory) / 'baseline.json'
+            call_command('benchmark_api', output=output, baseline=baseline, save_baseline=True, **options)
+            results = json.loads(output.read_text())
+            self.assertEqual(len(results['scenarios']), len(SCENARIOS))
+            self.assertEqual({r['errors'] for r in results['scenarios'].values()}, {0})
+            self.assertEqual(results['scenarios']['projects']['path'], reverse('project-list'))
+            self.assertIn('p99_ms', results['scenarios']['projects'])
+
+            stored = json.loads(baseline.read_text())
+            stored['scenarios']['projects']['queries'] = -1
+            baseline.write_text(json.dumps(stored))
+            with self.assertRaisesMessage(CommandError, 'projects: -1 -> '):
+                call_command('benchmark_api', output=output, baseline=baseline, scenarios=['projects'], **options)
+        self.assertFalse(Project.objects.exists())
+
+
+class ProfilerTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        overrides = self.settings(PORTFOLIO_PROFILE_DIR=Path(self.directory.name), PORTFOLIO_PROFILE_SLOW_QUERY_MS=0)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        create_project('Profiled', team=[create_employee()])
+
+    def token(self, user):
+        return str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+
+    def test_staff_token_profiles_the_request(self):
+        response = self.client.get(
+            reverse('project-list'), {'profile': '1'}, HTTP_AUTHORIZATION=f'Bearer {self.token(self.staff)}',
+        )
+        self.assertEqual(response.status_code, 200)
+        report = load_report(response['X-Profile-Report'])
+        self.assertEqual(report['path'], reverse('project-list'))
+        self.assertEqual(report['query_count'], len(report['queries']))
+        selects = [q for q in report['queries'] if q['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        self.assertTrue(all(q['slow'] and q['plan'] for q in selects))
+        self.assertIn('cumulative', report['profile'])
+        self.assertIsNotNone(stats_path(report['id']))
+
+    def test_header_flag_and_non_staff(self):
+        response = self.client.get(reverse('service-list'), HTTP_X_PROFILE='1',
+                                   HTTP_AUTHORIZATION=f'Bearer {self.token(self.staff)}')
+        self.assertIn('X-Profile-Report', response)
+        user = User.objects.create_user('visitor', password='pw')
+        for headers in ({}, {'HTTP_AUTHORIZATION': f'Bearer {self.token(user)}'}):
+            response = self.client.get(reverse('service-list'), {'profile': '1'}, **headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('X-Profile-Report', response)
+        self.assertEqual(len(list_reports()), 1)
+
+    def test_unflagged_requests_are_untouched(self):
+        with patch('portfolio.middleware.RequestProfiler') as profiler:
+            self.client.get(reverse('service-list'), HTTP_AUTHORIZATION=f'Bearer {self.token(self.staff)}')
+        profiler.assert_not_called()
+
+    async def test_async_views_can_be_profiled(self):
+        token = await sync_to_async(self.token)(self.staff)
+        response = await self.async_client.get(
+            reverse('async-project-list'), {'profile': 'true'}, headers={'Authorization': f'Bearer {token}'},
+        )
+        self.assertEqual(response.status_code, 200)
+        report = await sync_to_async(load_report)(response['X-Profile-Report'])
+        self.assertEqual(report['path'], reverse('async-project-list'))
+
+    def test_admin_pages(self):
+        self.client.force_login(self.staff)
+        report_id = self.client.get(reverse('project-list'), {'profile': '1'})['X-Profile-Report']
+        self.assertContains(self.client.get(reverse('admin-profile-list')), report_id)
+        response = self.client.get(reverse('admin-profile-detail', args=[report_id]))
+        self.assertContains(response, 'portfolio_project')
+        self.assertContains(response, 'Download cProfile stats')
+        self.assertEqual(self.client.get(reverse('admin-profile-stats', args=[report_id])).status_code, 200)
+        self.assertEqual(self.client.get(reverse('admin-profile-detail', args=['missing'])).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('admin-profile-list')).status_code, 302)
@@ -7,6 +7,16 @@ from .views import (
     ContactInformationViewSet,
     ContactMessageViewSet,
     TestimonialViewSet,
+    BundleView,
+    SearchView,
+    MetricsView,
+)
+from .async_views import (
+    AsyncServiceView,
+    AsyncEmployeeView,
+    AsyncProjectView,
+    AsyncContactInformationView,
+    AsyncTestimonialView,
 )
 
 router = DefaultRouter()
@@ -17,6 +27,25 @@ router.register(r'contact-info', ContactInformationViewSet)
 router.register(r'contact-messages', ContactMessageViewSet)
 router.register(r'testimonials', TestimonialViewSet)
 
+# Async read-only mirrors of the public endpoints, for ASGI deployments
+async_views = [
+    ('services', 'service', AsyncServiceView),
+    ('employees', 'employee', AsyncEmployeeView),
+    ('projects', 'project', AsyncProjectView),
+    ('contact-info', 'contactinformation', AsyncContactInformationView),
+    ('testimonials', 'testimonial', AsyncTestimonialView),
+]
+
 urlpatterns = [
+    path('bundle/', BundleView.as_view(), name='bundle'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
+]
+for prefix, basename, view in async_views:
+    urlpatterns += [
+        path(f'async/{prefix}/', view.as_view(), name=f'async-{basename}-list'),
+        path(f'async/{prefix}/<int:pk>/', view.as_view(), name=f'async-{basename}-detail'),
+    ]
+urlpatterns += [
     path('', include(router.urls)),
 ]
@@ -1,36 +1,59 @@
+from django.conf import settings
+from django.http import HttpResponse
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.throttling import ScopedRateThrottle
+from rest_framework.views import APIView
+from django.utils.crypto import constant_time_compare
+from django.utils.http import quote_etag
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from .bulk import UnknownEmployees, bulk_update_messages, update_team_members
+from .bundle import bundle_versions, get_bundle
+from .cache import cache_response
+from .conditional import conditional_get, not_modified
+from .instrumentation import timed_serialization
+from .ingest import QueueFull, contact_queue_enabled, enqueue_message
+from .metrics import metrics
+from .mixins import CachedResponseMixin, FastSerializationMixin, SparseFieldsMixin
+from .pagination import CursorOptInPagination, MessagePagination
+from .search import SEARCH_TYPES, search
 from .models import Service, Employee, Project, ContactInformation, ContactMessage, Testimonial
 from .serializers import (
     ServiceSerializer,
     EmployeeSerializer,
+    EmployeeListSerializer,
     ProjectSerializer,
+    ProjectListSerializer,
     ContactInformationSerializer,
     ContactMessageSerializer,
+    ContactMessageBulkUpdateSerializer,
+    TeamMembershipSerializer,
     TestimonialSerializer,
 )
 
 # Create your views here.
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(CachedResponseMixin, SparseFieldsMixin, FastSerializationMixin, viewsets.ModelViewSet):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Validators, COUNT(*) when paginated by page, the rows, and the auth
+    # version lookup a staff token costs when its cached copy has expired
+    query_budget = {'list': 4, 'retrieve': 3}
+    cache_models = (Service,)
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        print("Service data:", data)  # Debug print
-        return Response(data)
-
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(CachedResponseMixin, SparseFieldsMixin, FastSerializationMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.filter(is_active=True)
     serializer_class = EmployeeSerializer
+    sparse_serializer_class = EmployeeListSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # As on services, including a staff token's auth version lookup
+    query_budget = {'list': 4, 'retrieve': 3}
+    cache_models = (Employee,)
+    cache_query_params = CachedResponseMixin.cache_query_params + ('department',)
 
     def get_queryset(self):
         queryset = Employee.objects.filter(is_active=True)
@@ -39,20 +62,30 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(department=department)
         return queryset
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        print("Employee data:", data)  # Debug print
-        return Response(data)
-
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(CachedResponseMixin, SparseFieldsMixin, FastSerializationMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    sparse_serializer_class = ProjectListSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CursorOptInPagination
+    # Validators, COUNT(*) when paginated by page, the projects, a single
+    # prefetch query for the team members of every project on the page, and
+    # a staff token's auth version lookup. Team updates add the id check,
+    # the current team, DELETE, INSERT and the transaction's two statements.
+    query_budget = {'list': 5, 'retrieve': 4, 'update_team_members': 8}
+    cache_models = (Project, Employee)
+    cache_query_params = CachedResponseMixin.cache_query_params + (
+        'status', 'category', 'cursor', 'pagination',
+    )
 
     def get_queryset(self):
         queryset = Project.objects.all()
+        # Membership actions read the team themselves and never render it
+        if self.action not in ('assign_team_member', 'remove_team_member', 'update_team_members'):
+            # Order members fully so every read path agrees on tie-breaks
+            queryset = queryset.prefetch_related(
+                Prefetch('team_members', queryset=Employee.objects.order_by('name', 'id'))
+            )
         status = self.request.query_params.get('status', None)
         category = self.request.query_params.get('category', None)
 
@@ -62,13 +95,6 @@ class ProjectViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(category=category)
         return queryset
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        print("Project data:", data)  # Debug print
-        return Response(data)
-
     @action(detail=True, methods=['post'])
     def assign_team_member(self, request, pk=None):
         project = self.get_object()
@@ -99,40 +125,80 @@ class ProjectViewSet(viewsets.ModelViewSet):
         project.team_members.remove(employee)
         return Response({'status': 'team member removed'})
 
-class ContactInformationViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['post'])
+    def update_team_members(self, request, pk=None):
+        project = self.get_object()
+        serializer = TeamMembershipSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            members = update_team_members(project, **serializer.validated_data)
+        except UnknownEmployees as exc:
+            return Response(
+                {'error': 'Unknown employee ids', 'ids': exc.ids},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'team_members': members})
+
+class ContactInformationViewSet(CachedResponseMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = ContactInformation.objects.all()
     serializer_class = ContactInformationSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Validators, the row, and a staff token's auth version lookup
+    query_budget = {'list': 3, 'retrieve': 3}
+    cache_models = (ContactInformation,)
 
+    @conditional_get
+    @cache_response
     def list(self, request, *args, **kwargs):
         # Return only the first instance as we should only have one
-        instance = self.get_queryset().first()
+        instance = self.filter_queryset(self.get_queryset()).first()
         if instance:
             serializer = self.get_serializer(instance)
             data = serializer.data
             return Response(data)
         return Response({})
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(SparseFieldsMixin, FastSerializationMixin, viewsets.ModelViewSet):
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = MessagePagination
+    # Every action is authenticated, so a token revocation check (one user
+    # query whenever its cached auth version expires) counts too
+    query_budget = {'list': 3, 'retrieve': 2, 'bulk_update': 2}
+    throttle_scope = 'contact'
 
     def get_permissions(self):
         if self.action == 'create':
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset().order_by('-created_at')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    def get_throttles(self):
+        # Per-IP limit on the public form only
+        if self.action == 'create':
+            return [ScopedRateThrottle()]
+        return super().get_throttles()
+
+    def create(self, request, *args, **kwargs):
+        if not contact_queue_enabled():
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            ticket = enqueue_message(serializer.validated_data, request.META.get('REMOTE_ADDR'))
+        except QueueFull:
+            return Response(
+                {'error': 'Too many messages right now, please try again shortly'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': '30'},
+            )
+        return Response({'status': 'queued', 'ticket': ticket}, status=status.HTTP_202_ACCEPTED)
 
     @action(detail=True, methods=['post'])
     def mark_as_read(self, request, pk=None):
         message = self.get_object()
         message.is_read = True
-        message.save()
+        message.save(update_fields=['is_read', 'updated_at'])
         return Response({'status': 'marked as read'})
 
     @action(detail=True, methods=['post'])
@@ -147,13 +213,30 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
             )
 
         message.status = new_status
-        message.save()
+        message.save(update_fields=['status', 'updated_at'])
         return Response({'status': 'status updated'})
 
-class TestimonialViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        serializer = ContactMessageBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if 'ids' in data:
+            queryset = ContactMessage.objects.filter(pk__in=data['ids'])
+        else:
+            queryset = ContactMessage.objects.filter(**data['filter'])
+        changes = {name: data[name] for name in ('status', 'is_read') if name in data}
+        return Response({'updated': bulk_update_messages(queryset, **changes)})
+
+class TestimonialViewSet(CachedResponseMixin, SparseFieldsMixin, FastSerializationMixin, viewsets.ModelViewSet):
     queryset = Testimonial.objects.filter(is_active=True)
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CursorOptInPagination
+    # As on services, including a staff token's auth version lookup
+    query_budget = {'list': 4, 'retrieve': 3}
+    cache_models = (Testimonial,)
+    cache_query_params = CachedResponseMixin.cache_query_params + ('rating', 'cursor', 'pagination')
 
     def get_queryset(self):
         queryset = Testimonial.objects.filter(is_active=True)
@@ -162,8 +245,68 @@ class TestimonialViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(rating=rating)
         return queryset
 
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        data = serializer.data
-        return Response(data)
+class BundleView(APIView):
+    """
+    Everything the homepage needs in one response: services, employees,
+    projects, testimonials and contact info, served from a versioned
+    snapshot that only rebuilds the sections whose models changed.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        versions, etag = bundle_versions(request)
+        if not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            with timed_serialization(request):
+                response = Response(get_bundle(request, versions, etag))
+        response['ETag'] = quote_etag(etag)
+        return response
+
+
+class SearchView(APIView):
+    """
+    Ranked full-text search over public services, employees, projects and
+    testimonials: ``?q=`` words (prefix matched), optional ``?type=`` list
+    and ``?limit=`` (default 20, at most 100).
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '')
+        types = [name for name in request.query_params.get('type', '').split(',') if name]
+        unknown = sorted(set(types) - SEARCH_TYPES.keys())
+        if unknown:
+            return Response(
+                {'error': f"Unknown type: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(search(query, types, max(limit, 1)))
+
+
+class MetricsPermission(permissions.BasePermission):
+    """
+    Staff users, or a scraper that sends PORTFOLIO_METRICS_TOKEN in an
+    ``X-Metrics-Token`` header. Without that setting only staff get in.
+    """
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = getattr(settings, 'PORTFOLIO_METRICS_TOKEN', None)
+        return bool(token) and constant_time_compare(request.META.get('HTTP_X_METRICS_TOKEN', ''), token)
+
+
+class MetricsView(APIView):
+    """Request histograms per view and action in the Prometheus text format."""
+    permission_classes = [MetricsPermission]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')